@@ -0,0 +1,97 @@
+package main
+
+import "core:fmt"
+import "core:strings"
+
+// Workload for bench.py, every variable of main is a benchmark case.
+
+Foo :: struct {name: string, value: int}
+
+Vec3      :: struct {x, y, z: f32}
+Transform :: struct {position: Vec3, rotation: [4]f32, scale: Vec3}
+
+Key_Event   :: struct {key: int, pressed: bool}
+Mouse_Event :: struct {x, y: f32, button: u8}
+Event       :: union {Key_Event, Mouse_Event, string}
+
+Deep_3 :: struct {name: string, values: []int}
+Deep_2 :: struct {name: string, next: Deep_3, lookup: map[string]int}
+Deep_1 :: struct {name: string, next: Deep_2, items: [dynamic]Foo}
+Deep_0 :: struct {name: string, next: Deep_1, transform: Transform}
+
+make_int_map :: proc (n: int) -> map[int]int {
+	m := make(map[int]int, n)
+	for i in 0..<n {
+		m[i] = i * 2
+	}
+	return m
+}
+
+main :: proc () {
+
+	map_1e3 := make_int_map(1_000)
+	map_1e4 := make_int_map(10_000)
+	map_1e5 := make_int_map(100_000)
+	map_1e6 := make_int_map(1_000_000)
+
+	map_str := make(map[string]Foo, 100_000)
+	for i in 0..<100_000 {
+		key := fmt.aprintf("key_%d", i)
+		map_str[key] = Foo{key, i}
+	}
+
+	slice_int := make([]int, 10_000_000)
+	for &x, i in slice_int {
+		x = i
+	}
+
+	slice_f32 := make([]f32, 10_000_000)
+	for &x, i in slice_f32 {
+		x = f32(i) * 0.5
+	}
+
+	slice_foo := make([dynamic]Foo, 0, 1_000_000)
+	for i in 0..<1_000_000 {
+		append(&slice_foo, Foo{"foo", i})
+	}
+
+	slice_transform := make([]Transform, 100_000)
+	for &t, i in slice_transform {
+		t = Transform{{f32(i), 0, 0}, {0, 0, 0, 1}, {1, 1, 1}}
+	}
+
+	str_long := strings.repeat("odin ", 4 * 1024 * 1024) // 20 MB
+
+	lookup := make(map[string]int)
+	lookup["a"] = 1
+	lookup["b"] = 2
+
+	deep := Deep_0{
+		name = "level 0",
+		next = Deep_1{
+			name = "level 1",
+			next = Deep_2{
+				name   = "level 2",
+				next   = Deep_3{name = "level 3", values = slice_int[:1000]},
+				lookup = lookup,
+			},
+			items = slice_foo,
+		},
+		transform = {{1, 2, 3}, {0, 0, 0, 1}, {1, 1, 1}},
+	}
+
+	events := make([]Event, 1_000_000)
+	for &e, i in events {
+		switch i % 3 {
+		case 0: e = Key_Event{i, true}
+		case 1: e = Mouse_Event{f32(i), 0, 1}
+		case 2: e = "event"
+		}
+	}
+
+	breakpoint() // for lldb to breakpoint here
+	return
+}
+
+@(link_name="breakpoint")
+breakpoint :: proc () {}
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the LLDB Odin formatters.
+
+This script:
+1. Builds bench.odin, a program with large maps, slices, strings, structs and unions
+2. Runs an LLDB session in batch mode that imports this file as well,
+   the odin-bench command then times each formatter on the variables of bench.odin
+3. Writes the timings with percentiles to bench_results.json
+4. Compares them against a baseline, if there is one
+
+Usage:
+    ./bench.py                      run and compare against bench_baseline.json
+    ./bench.py --save-baseline      run and store the results as the new baseline
+    ./bench.py --repeat 50          number of timed runs per case
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+# (variable, operations)
+CASES = [
+    ("map_1e3",         ["summary", "children"]),
+    ("map_1e4",         ["summary", "children"]),
+    ("map_1e5",         ["summary", "children"]),
+    ("map_1e6",         ["summary", "children"]),
+    ("map_str",         ["summary", "children"]),
+    ("slice_int",       ["summary", "children"]),
+    ("slice_f32",       ["summary", "children"]),
+    ("slice_foo",       ["summary", "children"]),
+    ("slice_transform", ["summary", "children"]),
+    ("str_long",        ["summary"]),
+    ("deep",            ["summary"]),
+    ("events",          ["summary", "children"]),
+]
+
+# Children expanded by the "children" operation, about what an IDE shows at once
+CHILDREN_PAGE = 100
+
+SAMPLES_FILE  = "bench_samples.json"
+RESULTS_FILE  = "bench_results.json"
+BASELINE_FILE = "bench_baseline.json"
+OUTPUT_FILE   = "bench_output.txt"
+
+
+# ------------------------------------------------------------------------------
+# LLDB side
+#
+# Imported into the session with `command script import bench.py`
+
+def bench_summary(odin, value) -> None:
+    odin.summary(value, {})
+
+def bench_children(odin, value) -> None:
+    provider = odin.Children_Provider(value.GetNonSyntheticValue(), {})
+    provider.update()
+    for i in range(min(provider.num_children(), CHILDREN_PAGE)):
+        odin.value_summary(provider.get_child_at_index(i))
+
+OPERATIONS = {
+    "summary":  bench_summary,
+    "children": bench_children,
+}
+
+# LLDB looks the recognizers up by name on every call,
+# they are swapped for counting wrappers while the frame is formatted (like odin-profile does)
+RECOGNIZERS = ("is_type_summarized", "is_type_summarized_no_value", "is_type_synthesized")
+
+def count_recognizer_calls(odin, calls: list[int]) -> list[tuple[str, object]]:
+    """Wraps the recognizers to count their calls in calls[0], returns the originals."""
+    originals = [(name, getattr(odin, name)) for name in RECOGNIZERS]
+
+    def counted(fn):
+        def recognizer(t, _dict) -> bool:
+            calls[0] += 1
+            return fn(t, _dict)
+        return recognizer
+
+    for name, fn in originals:
+        setattr(odin, name, counted(fn))
+    return originals
+
+def bench_command(debugger, command, result, _dict) -> None:
+    """odin-bench <samples.json> [repeat] -- times the formatters on the variables of bench.odin"""
+    import odin
+
+    args = command.split()
+    if not args:
+        result.SetError("Usage: odin-bench <samples.json> [repeat]")
+        return
+
+    out_path = args[0]
+    repeat   = int(args[1]) if len(args) > 1 else 10
+
+    frame = debugger.GetSelectedTarget().GetProcess().GetSelectedThread().GetSelectedFrame()
+
+    samples: dict[str, list[float]] = {}
+
+    for name, operations in CASES:
+        value = frame.FindVariable(name)
+        if not value.IsValid():
+            result.AppendWarning(f"Variable '{name}' not found")
+            continue
+
+        for operation in operations:
+            fn = OPERATIONS[operation]
+            times = []
+            for _ in range(repeat):
+                # measure the formatters, not the caches
+                odin.STOP_CACHE.clear()
+                odin.MEMORY_CACHE.clear()
+                start = time.perf_counter_ns()
+                fn(odin, value)
+                times.append((time.perf_counter_ns() - start) / 1e6)
+
+            samples[f"{name}.{operation}"] = times
+            result.AppendMessage(f"{name}.{operation}: {min(times):.3f} ms")
+
+    # the whole frame through LLDB, which also asks the recognizers about every type
+    import lldb
+    interpreter = debugger.GetCommandInterpreter()
+    times       = []
+    calls       = [0]
+    originals   = count_recognizer_calls(odin, calls)
+    try:
+        for _ in range(repeat):
+            odin.STOP_CACHE.clear()
+            odin.MEMORY_CACHE.clear()
+            output = lldb.SBCommandReturnObject()
+            start  = time.perf_counter_ns()
+            interpreter.HandleCommand("frame variable", output)
+            times.append((time.perf_counter_ns() - start) / 1e6)
+    finally:
+        for name, fn in originals:
+            setattr(odin, name, fn)
+
+    recognizer_calls = calls[0]
+    samples["frame_variable"] = times
+    result.AppendMessage(f"frame_variable: {min(times):.3f} ms, recognizer calls: {recognizer_calls}")
+
+    with open(out_path, "w") as f:
+        json.dump({"repeat": repeat, "samples": samples, "recognizer_calls": recognizer_calls}, f)
+
+def __lldb_init_module(debugger, internal_dict):
+    debugger.HandleCommand("command script add -f bench.bench_command odin-bench")
+
+
+# ------------------------------------------------------------------------------
+# Runner
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """Nearest-rank percentile."""
+    rank = max(1, round(p / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    values = sorted(samples)
+    return {
+        "first": samples[0],
+        "min":   values[0],
+        "p50":   percentile(values, 50),
+        "p90":   percentile(values, 90),
+        "p99":   percentile(values, 99),
+        "max":   values[-1],
+    }
+
+def build() -> bool:
+    print(info("Building bench.odin..."))
+    print_line("odin build")
+    try:
+        subprocess.run(["odin", "build", "bench.odin", "-file", "-debug", "-out:bench.bin"], check=True)
+        print_line("success", color=ANSI.GREEN)
+        return True
+    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+        print_line(f"failed: {e}", color=ANSI.RED)
+        return False
+
+def run_lldb(repeat: int, timeout: int) -> dict | None:
+    cmd = ["lldb", "bench.bin",
+           "--no-lldbinit",
+           "--batch",
+           "-o", "command script import odin.py",
+           "-o", "command script import bench.py",
+           "-o", "b breakpoint",
+           "-o", "r",
+           "-o", "up",
+           "-o", f"odin-bench {SAMPLES_FILE} {repeat}",
+           "-o", "quit"]
+
+    print(info("Running LLDB session:\n"), " ".join(cmd))
+
+    if os.path.exists(SAMPLES_FILE):
+        os.remove(SAMPLES_FILE)
+
+    try:
+        with open(OUTPUT_FILE, "w") as output:
+            subprocess.run(cmd, stdout=output, stderr=subprocess.STDOUT, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        print(error(f"LLDB session timed out after {timeout} seconds"))
+        return None
+
+    if not os.path.exists(SAMPLES_FILE):
+        print(error(f"No samples written, see {OUTPUT_FILE}"))
+        return None
+
+    with open(SAMPLES_FILE) as f:
+        return json.load(f)
+
+def compare(results: dict, baseline: dict, tolerance: float, noise_ms: float) -> int:
+    """Prints the change of every case against the baseline, returns the number of regressions."""
+    regressions = 0
+
+    for case, stats in results["cases"].items():
+        base = baseline["cases"].get(case)
+        if base is None:
+            print(f"  {case:<28} {stats['p50']:>10.3f} ms  {warning('(new)')}")
+            continue
+
+        ratio = stats["p50"] / base["p50"] if base["p50"] > 0 else 1
+        line  = f"  {case:<28} {stats['p50']:>10.3f} ms  {base['p50']:>10.3f} ms  {ratio:>6.2f}x"
+
+        if ratio > 1 + tolerance and stats["p50"] - base["p50"] > noise_ms:
+            regressions += 1
+            print(error(line + "  REGRESSION"))
+        elif ratio < 1 - tolerance:
+            print(success(line))
+        else:
+            print(line)
+
+    return regressions
+
+def main() -> bool:
+    parser = argparse.ArgumentParser(description="Benchmark the LLDB Odin formatters")
+    parser.add_argument("--repeat",        type=int,   default=10,   help="timed runs per case")
+    parser.add_argument("--timeout",       type=int,   default=600,  help="LLDB session timeout in seconds")
+    parser.add_argument("--baseline",      default=BASELINE_FILE,    help="results to compare against")
+    parser.add_argument("--save-baseline", action="store_true",      help="store the results as the baseline")
+    parser.add_argument("--tolerance",     type=float, default=0.25, help="allowed p50 slowdown ratio")
+    parser.add_argument("--noise",         type=float, default=1.0,  help="ignore p50 changes below this many ms")
+    args = parser.parse_args()
+
+    print(highlight("Starting LLDB Odin benchmark..."))
+
+    if not check_dependencies() or not build():
+        return False
+
+    data = run_lldb(args.repeat, args.timeout)
+    if data is None:
+        return False
+
+    results = {
+        "repeat":           data["repeat"],
+        "recognizer_calls": data.get("recognizer_calls"),
+        "cases":            {case: summarize(samples) for case, samples in data["samples"].items()},
+    }
+    print(info(f"Recognizer calls during frame variable: {results['recognizer_calls']}"))
+
+    with open(RESULTS_FILE, "w") as f:
+        json.dump(results, f, indent=4)
+    print(info(f"Results written to {RESULTS_FILE}"))
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=4)
+        print(success(f"Baseline saved to {args.baseline}"))
+        return True
+
+    if not os.path.exists(args.baseline):
+        for case, stats in results["cases"].items():
+            print(f"  {case:<28} p50 {stats['p50']:>10.3f} ms  p90 {stats['p90']:>10.3f} ms  p99 {stats['p99']:>10.3f} ms")
+        print(warning(f"No baseline at {args.baseline}, run with --save-baseline to create one"))
+        return True
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    print_line("p50 vs baseline")
+    regressions = compare(results, baseline, args.tolerance, args.noise)
+
+    if regressions > 0:
+        print(error(f"{regressions} regressions"))
+        return False
+
+    print(success("No regressions"))
+    return True
+
+
+if __name__ == "__main__":
+    from test import ANSI, info, success, error, warning, highlight, print_line, check_dependencies
+    sys.exit(0 if main() else 1)
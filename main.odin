@@ -2,22 +2,35 @@
 package main
 
 import "base:runtime"
+import "core:container/list"
 import "core:fmt"
 import "core:io"
 
-Enum     :: enum u8 {One, Two, Three}
-Enum_Int :: enum int {One, Two, Three}
+Enum        :: enum u8 {One, Two, Three}
+Enum_Int    :: enum int {One, Two, Three}
+Enum_Sparse :: enum i16 {Low = -5, Mid = 10, High = 1000, Top = High}
+
+Direction  :: enum {North, East, South, West}
+Directions :: bit_set[Direction]
+Flags      :: bit_field u8 {visible: bool | 1, locked: b8 | 1}
+Same_Bits  :: bit_field u8 {a: u32 | 1, b: u32 | 1}
 
 Foo :: struct {foo_name: string, value: int}
 Bar :: struct {value: int, bar_name: string}
 
 Struct_Empty :: struct {}
 Struct_Long  :: struct {a, b, c, d, e, f: int}
+Struct_Plain :: struct {position: [3]f32, kind: Enum, id: u32, alive: bool}
 
 Foo_Bar_Union            :: union {Foo, Bar, string}
 Foo_Bar_Union_No_Nill    :: union #no_nil {Foo, Bar}
 Foo_Bar_Union_Shared_Nil :: union #shared_nil {Enum, ^Foo, ^Bar}
 
+Node :: struct {value: int, next: ^Node}
+
+Job  :: struct {id: int, node: list.Node}
+Task :: struct {id: int, next: ^Task}
+
 main :: proc () {
 
 	struct_empty := Struct_Empty{}
@@ -28,6 +41,14 @@ main :: proc () {
 	// (lldb) p struct_long
 	// (main::Struct_Long) {100000001, 100000002, 100000003, 100000004, 100000005...}
 
+	struct_plain := Struct_Plain{{1, 2.5, -3}, .Two, 7, true}
+	// (lldb) p struct_plain
+	// (main::Struct_Plain) {[3]{1, 2.5, -3}, .Two, 7, true}
+
+	struct_plain_slice := []Struct_Plain{struct_plain, {}}
+	// (lldb) p struct_plain_slice
+	// ([]main::Struct_Plain) [2]{{[3]{1, 2.5, -3}, .Two, 7, true}...}
+
 	str_empty := ""
 	// (lldb) p str_empty
 	// (string) ""
@@ -44,9 +65,21 @@ main :: proc () {
 	// (lldb) p str_nil_with_len
 	// (string) {nil, 10}
 
+	cstr: cstring = "Hello"
+	// (lldb) p cstr
+	// (cstring) "Hello"
+
+	cstr_nil: cstring
+	// (lldb) p cstr_nil
+	// (cstring) nil
+
 	foo := Foo{"Hello", 42}
 	// (lldb) p foo
 	// (main::Foo) {"Hello", 42}
+	// (lldb) odin-dump foo --depth 1
+	// {"path": "foo", "depth": 0, "type": "main.Foo", "value": "{\"Hello\", 42}", "children": 2, "address": "%PTR%"}
+	// {"path": "foo.foo_name", "depth": 1, "type": "string", "value": "\"Hello\"", "children": 0, "address": "%PTR%"}
+	// {"path": "foo.value", "depth": 1, "type": "int", "value": "42", "children": 0, "address": "%PTR%"}
 
 	// (lldb) p foo.foo_name
 	// (string) "Hello"
@@ -55,6 +88,20 @@ main :: proc () {
 	// (lldb) p foo_ptr
 	// (main::Foo *) &{"Hello", 42}
 
+	node_ring: [3]Node
+	for &node, i in node_ring {
+		node = {i, &node_ring[(i + 1) % 3]}
+	}
+	// (lldb) p node_ring[0]
+	// (main::Node) {0, &{1, &{2, &<cycle %PTR%>}}}
+
+	node_chain: [8]Node
+	for &node, i in node_chain[:7] {
+		node = {i, &node_chain[i + 1]}
+	}
+	// (lldb) p node_chain[0]
+	// (main::Node) {0, &{1, &{2, &{3, &{4, &{...}}}}}}
+
 	foo_raw_ptr := rawptr(foo_ptr)
 	// (lldb) p foo_raw_ptr
 	// (void *) rawptr(%PTR%)
@@ -63,6 +110,18 @@ main :: proc () {
 	// (lldb) p bar
 	// (main::Bar) {84, "World"}
 
+	any_foo: any = foo
+	// (lldb) p any_foo
+	// (any) main.Foo({"Hello", 42})
+
+	any_nil: any
+	// (lldb) p any_nil
+	// (any) nil
+
+	typeid_foo := typeid_of(Foo)
+	// (lldb) p typeid_foo
+	// (typeid) main.Foo
+
 	enum_two := Enum.Two
 	// (lldb) p enum_two
 	// (main::Enum) .Two
@@ -87,6 +146,31 @@ main :: proc () {
 	// (lldb) p enum_int_out_of_bounds
 	// (main::Enum_Int) -100
 
+	enum_sparse := [?]Enum_Sparse{.Low, .Mid, .Top, Enum_Sparse(11)}
+	// (lldb) p enum_sparse
+	// (main::Enum_Sparse[4]) [4]{.Low, .Mid, .High, 11}
+
+	directions := Directions{.North, .South}
+	// (lldb) p directions
+	// (main::Directions) {.North, .South}
+	// (lldb) print_children directions
+	// North = 1
+	// South = 1
+
+	directions_empty := Directions{}
+	// (lldb) p directions_empty
+	// (main::Directions) {}
+
+	// 1 bit fields of a bit_field are not bit_set elements
+	flags := Flags{visible = true}
+	// (lldb) p flags
+	// (main::Flags) {true, false}
+
+	// even when they all have the same type
+	same_bits := Same_Bits{a = 1}
+	// (lldb) p same_bits
+	// (main::Same_Bits) {1, 0}
+
 	foo_bar_union: Foo_Bar_Union = "hello world"
 	// (lldb) p foo_bar_union
 	// (main::Foo_Bar_Union) string("hello world")
@@ -148,6 +232,25 @@ main :: proc () {
 	slice_long := []Foo{{"Slice1", 1}, {"Slice2", 2}, {"Slice3", 3}, {"Slice4", 4}, {"Slice5", 5}}
 	// (lldb) p slice_long
 	// ([]main::Foo) [5]{{"Slice1", 1}, {"Slice2", 2}, {"Slice3", 3}...}
+	// (lldb) odin-find slice_long value >= 4
+	// (main::Foo) [3] = {"Slice4", 4}
+	// (main::Foo) [4] = {"Slice5", 5}
+	// (lldb) odin-find slice_long foo_name == "Slice2"
+	// (main::Foo) [1] = {"Slice2", 2}
+	// (lldb) odin-find slice_long value > 5
+	// No match in slice_long
+
+	slice_int := []int{1, 2, -3}
+	// (lldb) p slice_int
+	// ([]int) [3]{1, 2, -3}
+
+	slice_f32 := []f32{1.5, 3.14, 0.1}
+	// (lldb) p slice_f32
+	// ([]f32) [3]{1.5, 3.1400001, 0.100000001}
+
+	slice_bool := []bool{true, false}
+	// (lldb) p slice_bool
+	// ([]bool) [2]{true, false}
 
 	slice_empty := []Foo{}
 	// (lldb) p slice_empty
@@ -197,6 +300,17 @@ main :: proc () {
 	// (main::Foo[1000]) dynamic_array_chunked[1] = [1000]{{"DynamicChunked", 1000}, {"DynamicChunked", 1001}...}
 	// (main::Foo) dynamic_array_chunked[1][0] = {"DynamicChunked", 1000}
 
+	// elements past the first chunk are reached by their index too
+	// (lldb) frame v dynamic_array_chunked[1500]
+	// (main::Foo) dynamic_array_chunked[1500] = {"DynamicChunked", 1500}
+
+	soa_foo: #soa[dynamic]Foo
+	append_soa(&soa_foo, Foo{"Soa1", 1}, Foo{"Soa2", 2})
+	// (lldb) p soa_foo
+	// (#soa[dynamic]main::Foo) [2]{{"Soa1", 1}, {"Soa2", 2}}
+	// (lldb) frame v soa_foo[1]
+	// (main::Foo) soa_foo[1] = {"Soa2", 2}
+
 	str_map: map[string]Foo = {"key1" = {"Value1", 1}}
 	// (lldb) p str_map
 	// (map[string]main::Foo) map[1]{"key1" = {"Value1", 1}}
@@ -215,6 +329,57 @@ main :: proc () {
 	// ["key3"] = {"Value3", 3}
 	// len = 3
 	// cap = 8
+	// (lldb) odin-map-get str_map_children "key2"
+	// (main::Foo) ["key2"] = {"Value2", 2}
+	// (lldb) odin-map-get str_map_children "key4"
+	// "key4" not found in str_map_children
+	// (lldb) odin-find str_map_children value.value == 2
+	// (main::Foo) ["key2"] = {"Value2", 2}
+
+	jobs: [3]Job
+	job_list: list.List
+	for &job, i in jobs {
+		job.id = i
+		list.push_back(&job_list, &job.node)
+	}
+	// (lldb) p job_list
+	// (list::List) list[3]
+	// (lldb) frame v job_list.len
+	// (int) job_list.len = 3
+
+	tasks: [3]Task
+	for &task, i in tasks[:2] {
+		task = {i, &tasks[i + 1]}
+	}
+	tasks[2].id = 2
+	task_head := &tasks[0]
+
+	task_ring: [3]Task
+	for &task, i in task_ring {
+		task = {i, &task_ring[(i + 1) % 3]}
+	}
+	task_ring_head := &task_ring[0]
+	job_list_ptr := &job_list
+
+	// changes how lists are shown for the rest of the session
+	// (lldb) odin-list main.Job node job_list
+	// job_list elements are shown as main.Job
+	// (lldb) odin-list main.Task next
+	// ^main.Task is shown as a list through next
+	// (lldb) frame v job_list
+	// (list::List) job_list = list[3]{{0}, {1}, {2}}
+	// (lldb) frame v job_list[1].id
+	// (int) job_list[1].id = 1
+	// (lldb) frame v job_list[2].id
+	// (int) job_list[2].id = 2
+	// (lldb) p job_list_ptr
+	// (list::List *) &list[3]{{0}, {1}, {2}}
+	// (lldb) p task_head
+	// (main::Task *) list[3]{{0}, {1}, {2}}
+	// (lldb) frame v task_head.len
+	// (int) task_head.len = 3
+	// (lldb) p task_ring_head
+	// (main::Task *) list[3]{{0}, {1}, {2}} <cycle to [0]>
 
 	breakpoint() // for lldb to breakpoint here
 	return
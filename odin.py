@@ -9,40 +9,97 @@ Repository: https://github.com/thetarnav/odin-lldb
 
 from webbrowser import get
 import lldb
+import re
+import sys
 import math
 import enum
-from collections.abc import Callable
+import json
+import time
+import array
+import ast
+import bisect
+import codecs
+import shlex
+import struct
+import functools
+import operator
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
 
 
 def __lldb_init_module(debugger: lldb.SBDebugger, unused) -> None:
-    debugger.HandleCommand("type summary add --python-function odin.struct_summary             --recognizer-function odin.is_type_struct")
-    debugger.HandleCommand("type summary add --python-function odin.pointer_summary --no-value --recognizer-function odin.is_type_pointer")
-    debugger.HandleCommand("type summary add --python-function odin.union_summary              --recognizer-function odin.is_type_union")
-    debugger.HandleCommand("type synth   add --python-class    odin.Union_Children_Provider    --recognizer-function odin.is_type_union")
-    debugger.HandleCommand("type summary add --python-function odin.string_summary             --recognizer-function odin.is_type_string")
-    debugger.HandleCommand("type synth   add --python-class    odin.Slice_Children_Provider    --recognizer-function odin.is_type_slice")
-    debugger.HandleCommand("type summary add --python-function odin.slice_summary              --recognizer-function odin.is_type_slice")
-    debugger.HandleCommand("type summary add --python-function odin.array_summary              --recognizer-function odin.is_type_array")
-    debugger.HandleCommand("type synth   add --python-class    odin.Map_Children_Provider      --recognizer-function odin.is_type_map")
-    debugger.HandleCommand("type summary add --python-function odin.map_summary                --recognizer-function odin.is_type_map")
-    debugger.HandleCommand("type summary add --python-function odin.enum_summary    --no-value --recognizer-function odin.is_type_enum")
+    # LLDB matches type names itself, the recognizers are only asked about types no name matched
+    for name, is_regex, no_value in SUMMARY_TYPE_NAMES:
+        function = "odin.summary_no_value --no-value" if no_value else "odin.summary"
+        regex    = "-x " if is_regex else ""
+        debugger.HandleCommand(f"type summary add --python-function {function} {regex}'{name}'")
+    for name, is_regex in SYNTH_TYPE_NAMES:
+        regex = "-x " if is_regex else ""
+        debugger.HandleCommand(f"type synth add --python-class odin.Children_Provider {regex}'{name}'")
+
+    debugger.HandleCommand("type summary add --python-function odin.summary              --recognizer-function odin.is_type_summarized")
+    debugger.HandleCommand("type summary add --python-function odin.summary   --no-value --recognizer-function odin.is_type_summarized_no_value")
+    debugger.HandleCommand("type synth   add --python-class    odin.Children_Provider    --recognizer-function odin.is_type_synthesized")
+    debugger.HandleCommand("command script add -f odin.cache_command odin-cache")
+    debugger.HandleCommand("command script add -f odin.profile_command odin-profile")
+    debugger.HandleCommand("command script add -f odin.map_get_command odin-map-get")
+    debugger.HandleCommand("command script add -f odin.list_command odin-list")
+    debugger.HandleCommand("command script add -f odin.dump_command odin-dump")
+    debugger.HandleCommand("command script add -f odin.find_command odin-find")
 
 
 class Odin_Type(enum.Enum):
     SLICE   = "slice"
     ARRAY   = "array"
     STRING  = "string" 
+    CSTRING = "cstring"
     MAP     = "map"
     STRUCT  = "struct"
     PTR     = "pointer"
     ENUM    = "enum"
+    UNION   = "union"
+    BIT_SET = "bit_set"
+    SOA     = "soa"
+    ANY     = "any"
+    TYPEID  = "typeid"
+    LIST    = "list"
     OTHER   = "other"
 
+# Classification only depends on the type, so it is computed once per type.
+# LLDB asks the recognizers about every value it displays.
+ODIN_TYPE_CACHE: dict[tuple[str, int], Odin_Type] = {}
+
 def get_odin_type(t: lldb.SBType) -> Odin_Type:
+    key = (t.name, t.type)
+
+    odin_type = ODIN_TYPE_CACHE.get(key)
+    if odin_type is None:
+        odin_type = classify_odin_type(t)
+        if t.name:
+            ODIN_TYPE_CACHE[key] = odin_type
+
+    return odin_type
+
+def classify_odin_type(t: lldb.SBType) -> Odin_Type:
+
+    if t.name == "cstring":
+        return Odin_Type.CSTRING
+
+    if t.name == "typeid":
+        return Odin_Type.TYPEID
+
+    if t.name == "any" and t.type == lldb.eTypeClassStruct:
+        return Odin_Type.ANY
     
+    if t.type in (lldb.eTypeClassStruct, lldb.eTypeClassUnion) and type_is_bit_set(t):
+        return Odin_Type.BIT_SET
+
     if t.type == lldb.eTypeClassStruct:
         if t.name == "string":
             return Odin_Type.STRING
+
+        if type_is_soa_slice(t):
+            return Odin_Type.SOA
         
         if (
             (t.name.startswith("[]") or t.name.startswith("[dynamic]")) and
@@ -53,6 +110,9 @@ def get_odin_type(t: lldb.SBType) -> Odin_Type:
         if t.name.startswith("map["):
             return Odin_Type.MAP
 
+        if t.name == LIST_TYPE_NAME:
+            return Odin_Type.LIST
+
         return Odin_Type.STRUCT
 
     if t.type == lldb.eTypeClassArray:
@@ -61,19 +121,19 @@ def get_odin_type(t: lldb.SBType) -> Odin_Type:
     if t.type == lldb.eTypeClassEnumeration:
         return Odin_Type.ENUM
 
+    if t.type == lldb.eTypeClassUnion:
+        tag = type_get_field_at(t, 0)
+        if tag.IsValid() and tag.name == "tag":
+            return Odin_Type.UNION
+        return Odin_Type.OTHER
+
     if t.is_pointer:
+        if t.GetPointeeType().name in LINKED_TYPES:
+            return Odin_Type.LIST
         return Odin_Type.PTR
     
     return Odin_Type.OTHER
 
-def is_type_slice  (t: lldb.SBType, _dict) -> bool: return get_odin_type(t) == Odin_Type.SLICE
-def is_type_string (t: lldb.SBType, _dict) -> bool: return get_odin_type(t) == Odin_Type.STRING
-def is_type_map    (t: lldb.SBType, _dict) -> bool: return get_odin_type(t) == Odin_Type.MAP
-def is_type_struct (t: lldb.SBType, _dict) -> bool: return get_odin_type(t) == Odin_Type.STRUCT
-def is_type_pointer(t: lldb.SBType, _dict) -> bool: return get_odin_type(t) == Odin_Type.PTR
-def is_type_array  (t: lldb.SBType, _dict) -> bool: return get_odin_type(t) == Odin_Type.ARRAY
-def is_type_enum   (t: lldb.SBType, _dict) -> bool: return get_odin_type(t) == Odin_Type.ENUM
-
 def type_get_field_at(t: lldb.SBType, idx: int) -> lldb.SBTypeMember:
     return t.GetFieldAtIndex(idx)
 
@@ -95,27 +155,100 @@ def type_display(t: lldb.SBType) -> str:
     if t.is_reference: name = f"&{name}"
     return name
 
-def value_summary(value: lldb.SBValue) -> str:
+def read_memory(process: lldb.SBProcess, addr: int, size: int) -> bytes | None:
+    if size <= 0:
+        return b""
+
+    if size > MEMORY_CACHE_MAX_READ:
+        return MEMORY_CACHE.read_direct(process, addr, size)
+
+    return MEMORY_CACHE.read(process, addr, size)
+
+def process_read_memory(process: lldb.SBProcess, addr: int, size: int) -> bytes | None:
+    error = lldb.SBError()
+    data = process.ReadMemory(addr, size, error)
+    if not error.success:
+        return None
+
+    return data
+
+def process_is_native_endian(process: lldb.SBProcess) -> bool:
+    order = lldb.eByteOrderLittle if sys.byteorder == "little" else lldb.eByteOrderBig
+    return process.GetByteOrder() == order
+
+# Characters left for the summary being computed, None if the caller shows all of it.
+# A summary that runs over its budget will be cut by the caller anyway,
+# so it can stop producing output (and reading memory) early.
+summary_budget: int | None = None
+
+# Pointers are followed by summaries, a linked structure would be summarized forever
+# (and read a lot of memory before the length cap applies).
+POINTER_SUMMARY_MAX_DEPTH = 4
+
+class Summary_Path:
+    """Values whose summary is being computed, from the outermost summary."""
+
+    def __init__(self) -> None:
+        self.nodes: list[tuple[int, str]] = [] # (address, type name)
+        self.depth  = 0 # pointers followed
+        # Summaries cut at a cycle or at the depth limit depend on the pointers that led to them,
+        # they are not cached
+        self.cuts   = 0
+
+SUMMARY_PATH = Summary_Path()
+
+def value_summary(value: lldb.SBValue, budget: int | None = None) -> str:
+    global summary_budget
+
     if not value.IsValid():
         return "<invalid value>"
-    return value.GetSummary() or value.GetValue() or "<no value>"
+
+    # Odin types are summarized directly,
+    # LLDB would keep the budgeted summary as the value's summary.
+    fn = SUMMARIES.get(get_odin_type(value.type))
+    if fn is None:
+        return value.GetSummary() or value.GetValue() or "<no value>"
+
+    outer_budget   = summary_budget
+    summary_budget = budget
+    try:
+        return fn(value, {}) or value.GetValue() or "<no value>"
+    finally:
+        summary_budget = outer_budget
 
 AGGREGATE_SUMMARY_MAX_LEN = 60
 SLICE_CHUNK_SIZE          = 1000
+STRING_SUMMARY_MAX_BYTES  = 4096 # e.g. `script odin.STRING_SUMMARY_MAX_BYTES = 1 << 20`
+STRING_READ_CHUNK_SIZE    = 1024
 
 def aggregate_value_summary(
     prefix:    str,
     suffix:    str,
-    get_value: Callable[[int], str],
+    get_value: Callable[[int, int | None], str], # (index, budget) -> item summary
     length:    int,
 ) -> str:
+    budget  = summary_budget
     summary = prefix
     
     for i in range(length):
-        item = get_value(i)
-        
         separator = ", " if i > 0 else ""
-        new_length = len(summary) + len(separator) + len(item) + len(suffix)
+        used      = len(summary) + len(separator) + len(suffix)
+
+        # the first item is always shown, other items only if they fit
+        if i == 0:
+            item_budget = None if budget is None else budget - used
+        else:
+            item_budget = AGGREGATE_SUMMARY_MAX_LEN - used
+            if budget is not None:
+                item_budget = min(item_budget, budget - used)
+
+            if item_budget < 0:
+                summary += "..."
+                break
+
+        item = get_value(i, item_budget)
+
+        new_length = used + len(item)
 
         if new_length > AGGREGATE_SUMMARY_MAX_LEN and i > 0:
             summary += "..."
@@ -123,37 +256,692 @@ def aggregate_value_summary(
 
         summary += separator + item
 
+        # over the caller's budget, it won't be shown
+        if budget is not None and len(summary) + len(suffix) > budget:
+            break
+
     return summary + suffix
 
 
+# ------------------------------------------------------------------------------
+# Stop Cache
+#
+# Memory of the inferior can only change while it runs,
+# so summaries and decoded children are cached until the stop ID changes.
+# Entries are keyed by (formatter, address, type name).
+
+STOP_CACHE_MAX_ENTRIES = 16384
+
+class Stop_Cache:
+    def __init__(self) -> None:
+        self.entries: OrderedDict[tuple, object] = OrderedDict()
+        self.stop:    tuple[int, int] | None = None
+        self.hits     = 0
+        self.misses   = 0
+
+    def sync(self, process: lldb.SBProcess) -> None:
+        # expression stops are included, evaluated code can write to memory
+        stop = (process.GetUniqueID(), process.GetStopID(True))
+        if stop != self.stop:
+            self.entries.clear()
+            self.stop = stop
+
+    def find(self, process: lldb.SBProcess, key: tuple) -> tuple[bool, object]:
+        self.sync(process)
+
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return True, self.entries[key]
+
+        self.misses += 1
+        return False, None
+
+    def put(self, key: tuple, value: object) -> None:
+        self.entries[key] = value
+        # read on every put, the setting can be changed at runtime
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def get(self, process: lldb.SBProcess, key: tuple, compute: Callable[[], object]) -> object:
+        found, value = self.find(process, key)
+        if not found:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    @property
+    def max_entries(self) -> int:
+        return STOP_CACHE_MAX_ENTRIES
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.hits   = 0
+        self.misses = 0
+
+STOP_CACHE = Stop_Cache()
+
+def cached_summary(fn: Callable[[lldb.SBValue, dict], str]) -> Callable[[lldb.SBValue, dict], str]:
+    """Caches the result of a summary function for values that live in memory and have a named type."""
+
+    @functools.wraps(fn)
+    def wrapper(v: lldb.SBValue, _dict) -> str:
+        addr = v.load_addr
+        # anonymous types at the same address (e.g. the variants of a #raw_union) would share an entry
+        if addr == lldb.LLDB_INVALID_ADDRESS or not v.type.name:
+            return fn(v, _dict)
+
+        key = (fn.__name__, addr, v.type.name, summary_budget)
+        found, result = STOP_CACHE.find(v.process, key)
+        if found:
+            return result
+
+        cuts   = SUMMARY_PATH.cuts
+        result = fn(v, _dict)
+        if SUMMARY_PATH.cuts == cuts:
+            STOP_CACHE.put(key, result)
+
+        return result
+
+    return wrapper
+
+# ------------------------------------------------------------------------------
+# Memory Cache
+#
+# read_memory keeps aligned pages of the inferior's memory until the stop ID changes.
+# Reads close to each other (map cells, fields of neighbouring elements, string chunks)
+# are served from the same page, and adjacent missing pages are fetched with a single read.
+# With a remote debug server every ReadMemory call is a round trip.
+
+MEMORY_PAGE_SIZE       = 16 * 1024 # 4 KB - 64 KB
+MEMORY_CACHE_MAX_PAGES = 1024
+# Larger reads go to the process directly, they would only evict other pages
+MEMORY_CACHE_MAX_READ  = 1 << 20
+
+class Page_Cache:
+    def __init__(self) -> None:
+        self.page_size   = MEMORY_PAGE_SIZE
+        # page address -> data, None if the page can't be read as a whole
+        self.pages: OrderedDict[int, bytes | None] = OrderedDict()
+        self.stop:  tuple[int, int] | None = None
+        self.requests    = 0
+        self.round_trips = 0
+        self.page_hits   = 0
+        self.bytes_read  = 0
+
+    def sync(self, process: lldb.SBProcess) -> None:
+        stop = (process.GetUniqueID(), process.GetStopID(True))
+        if stop != self.stop or self.page_size != MEMORY_PAGE_SIZE:
+            self.pages.clear()
+            self.stop      = stop
+            self.page_size = MEMORY_PAGE_SIZE
+
+    def read(self, process: lldb.SBProcess, addr: int, size: int) -> bytes | None:
+        self.sync(process)
+        self.requests += 1
+
+        page_size = self.page_size
+        first     = addr - addr % page_size
+        end       = addr + size + (-(addr + size) % page_size)
+
+        # fetch the missing pages, each run of adjacent ones with one read
+        missing = None
+        for page in range(first, end, page_size):
+            if page in self.pages:
+                self.page_hits += 1
+                self.pages.move_to_end(page)
+                if missing is not None:
+                    self.fetch(process, missing, page)
+                    missing = None
+            elif missing is None:
+                missing = page
+        if missing is not None:
+            self.fetch(process, missing, end)
+
+        chunks = []
+        for page in range(first, end, page_size):
+            data = self.pages.get(page)
+            if data is None:
+                # part of a page may still be mapped
+                self.round_trips += 1
+                return process_read_memory(process, addr, size)
+            chunks.append(data)
+
+        offset = addr - first
+        return b"".join(chunks)[offset:offset + size]
+
+    def read_direct(self, process: lldb.SBProcess, addr: int, size: int) -> bytes | None:
+        self.requests    += 1
+        self.round_trips += 1
+        return process_read_memory(process, addr, size)
+
+    def fetch(self, process: lldb.SBProcess, start: int, end: int) -> None:
+        page_size = self.page_size
+
+        self.round_trips += 1
+        data = process_read_memory(process, start, end - start)
+        if data is not None and len(data) == end - start:
+            self.bytes_read += len(data)
+            for page in range(start, end, page_size):
+                self.store(page, data[page - start:page - start + page_size])
+            return
+
+        if end - start == page_size:
+            self.store(start, None)
+            return
+
+        # some page of the run isn't mapped, fetch them one by one
+        for page in range(start, end, page_size):
+            self.round_trips += 1
+            data = process_read_memory(process, page, page_size)
+            if data is not None:
+                self.bytes_read += len(data)
+            self.store(page, data)
+
+    def store(self, page: int, data: bytes | None) -> None:
+        self.pages[page] = data
+        self.pages.move_to_end(page)
+        # read on every store, the setting can be changed at runtime
+        while len(self.pages) > self.max_pages:
+            self.pages.popitem(last=False)
+
+    @property
+    def max_pages(self) -> int:
+        return MEMORY_CACHE_MAX_PAGES
+
+    def clear(self) -> None:
+        self.pages.clear()
+        self.requests    = 0
+        self.round_trips = 0
+        self.page_hits   = 0
+        self.bytes_read  = 0
+
+MEMORY_CACHE = Page_Cache()
+
+def cache_command(
+    debugger: lldb.SBDebugger,
+    command:  str,
+    result:   lldb.SBCommandReturnObject,
+    _dict:    dict,
+) -> None:
+    """odin-cache [clear] -- prints (or resets) the stop cache and memory cache counters"""
+
+    if command.strip() == "clear":
+        STOP_CACHE.clear()
+        MEMORY_CACHE.clear()
+        MAP_LOOKUPS.clear()
+        result.AppendMessage("Cache cleared")
+        return
+
+    lookups  = STOP_CACHE.hits + STOP_CACHE.misses
+    hit_rate = STOP_CACHE.hits / lookups * 100 if lookups > 0 else 0
+    result.AppendMessage(f"entries: {len(STOP_CACHE.entries)}/{STOP_CACHE.max_entries}")
+    result.AppendMessage(f"hits:    {STOP_CACHE.hits}")
+    result.AppendMessage(f"misses:  {STOP_CACHE.misses}")
+    result.AppendMessage(f"hit rate: {hit_rate:.1f}%")
+
+    saved = MEMORY_CACHE.requests - MEMORY_CACHE.round_trips
+    result.AppendMessage(f"memory pages:       {len(MEMORY_CACHE.pages)}/{MEMORY_CACHE.max_pages} ({MEMORY_CACHE.page_size} bytes)")
+    result.AppendMessage(f"memory reads:       {MEMORY_CACHE.requests}")
+    result.AppendMessage(f"memory round trips: {MEMORY_CACHE.round_trips} ({saved} saved)")
+    result.AppendMessage(f"memory page hits:   {MEMORY_CACHE.page_hits}")
+    result.AppendMessage(f"memory bytes read:  {MEMORY_CACHE.bytes_read}")
+    result.AppendMessage(f"map keys probed:    {MAP_LOOKUPS.probed}")
+    result.AppendMessage(f"map keys scanned:   {MAP_LOOKUPS.scanned}")
+
+
 # ------------------------------------------------------------------------------
 # Struct Values
 #
 # Default for any struct type that is not a built-in type.
 
+@cached_summary
 def struct_summary(v: lldb.SBValue, _dict) -> str:
     v = v.GetNonSyntheticValue()
 
+    summary = plain_summary(v)
+    if summary is not None:
+        return summary
+
     return aggregate_value_summary("{", "}",
-        get_value=lambda i: value_summary(v.GetChildAtIndex(i)),
+        get_value=lambda i, budget: value_summary(v.GetChildAtIndex(i), budget),
         length=v.num_children,
     )
 
 
 # ------------------------------------------------------------------------------
 # Enum Values
+#
+# Values are looked up in a table built once per type,
+# members can have any values (`enum {A = 10, B = 1000}`) and share them.
+
+# type name -> {value: ".Name"}
+ENUM_NAMES: dict[str, dict[int, str]] = {}
+
+def enum_names(t: lldb.SBType) -> dict[int, str]:
+    names = ENUM_NAMES.get(t.name)
+    if names is None:
+        names = {}
+        for member in t.GetEnumMembers():
+            # for aliases the first member wins
+            if member.IsValid() and member.name:
+                names.setdefault(member.GetValueAsSigned(), f".{member.name}")
+        ENUM_NAMES[t.name] = names
+    return names
 
 def enum_summary(v: lldb.SBValue, _dict) -> str:
 
     num = v.GetValueAsSigned()
-    members = v.type.GetEnumMembers()
 
-    if members.IsValid() and 0 <= num < len(members):
-        member = members[num]
-        if member and member.IsValid() and member.name:
-            return f".{member.name}"
-    
-    return str(num)
+    return enum_names(v.type).get(num) or str(num)
+
+
+# ------------------------------------------------------------------------------
+# Bit Set Values
+#
+# bit_set[Enum] and bit_set[lo..<hi] are described as a union of 1 bit fields over the backing storage,
+# one for each element, named after the enum member (or the number):
+#
+#    bit_set[Direction; u8]
+#        North: bit 0
+#        East:  bit 1
+#        ...
+#
+# The storage is read once, the set bits are looked up in a table built once per type.
+#
+# A bit_field is a struct of bit fields, which may all be 1 bit of the same type.
+# Named bit_sets are told apart by being unions, a struct without the bit_set name is a bit_field.
+
+# type name -> {bit offset: (field index, element name)}
+BIT_SET_ELEMENTS: dict[str, dict[int, tuple[int, str]]] = {}
+
+BIT_SET_NUMBER_RE = re.compile(r"^-?\d+$")
+
+def type_is_bit_set(t: lldb.SBType) -> bool:
+    if t.name.startswith("bit_set["):
+        return True
+
+    num_fields = t.GetNumberOfFields()
+    if t.type != lldb.eTypeClassUnion or num_fields == 0:
+        return False
+
+    element_type = type_get_field_at(t, 0).type.GetCanonicalType()
+
+    for i in range(num_fields):
+        field = type_get_field_at(t, i)
+        if not field.IsBitfield() or field.GetBitfieldSizeInBits() != 1:
+            return False
+        if field.type.GetCanonicalType().name != element_type.name:
+            return False
+
+    return True
+
+def bit_set_elements(t: lldb.SBType) -> dict[int, tuple[int, str]]:
+    elements = BIT_SET_ELEMENTS.get(t.name)
+    if elements is None:
+        elements = {}
+        for i in range(t.GetNumberOfFields()):
+            field = type_get_field_at(t, i)
+            name  = field.name if BIT_SET_NUMBER_RE.match(field.name) else f".{field.name}"
+            elements[field.GetOffsetInBits()] = (i, name)
+        BIT_SET_ELEMENTS[t.name] = elements
+    return elements
+
+def bit_set_bits(v: lldb.SBValue) -> list[int] | None:
+    """Offsets of the set bits, decoded from a single read of the storage."""
+    v     = v.GetNonSyntheticValue()
+    error = lldb.SBError()
+
+    data = v.GetData().ReadRawData(error, 0, v.size)
+    if not error.success:
+        return None
+
+    order = "little" if v.process.GetByteOrder() == lldb.eByteOrderLittle else "big"
+    bits  = int.from_bytes(data, order)
+
+    offsets = []
+    while bits:
+        lowest = bits & -bits
+        offsets.append(lowest.bit_length() - 1)
+        bits ^= lowest
+
+    return offsets
+
+@cached_summary
+def bit_set_summary(v: lldb.SBValue, _dict) -> str:
+    offsets = bit_set_bits(v)
+    if offsets is None:
+        return "<error reading bit_set>"
+
+    elements = bit_set_elements(v.type)
+
+    def get_value(i: int, budget: int | None) -> str:
+        element = elements.get(offsets[i])
+        return element[1] if element else str(offsets[i])
+
+    return aggregate_value_summary("{", "}", get_value, len(offsets))
+
+class Bit_Set_Children_Provider(lldb.SBSyntheticValueProvider):
+    """Lists only the elements in the set."""
+
+    def __init__(self, val: lldb.SBValue, _dict) -> None:
+        self.val = val
+
+    def update(self) -> None:
+        elements = bit_set_elements(self.val.type)
+        offsets  = bit_set_bits(self.val) or []
+
+        # field indices of the set elements
+        self.fields = [elements[offset][0] for offset in offsets if offset in elements]
+
+    def has_children(self) -> bool:
+        return len(self.fields) > 0
+
+    def num_children(self) -> int:
+        return len(self.fields)
+
+    def get_child_at_index(self, idx: int) -> lldb.SBValue:
+        return self.val.GetNonSyntheticValue().GetChildAtIndex(self.fields[idx])
+
+    def get_child_index(self, name: str) -> int | None:
+        for i, field in enumerate(self.fields):
+            if type_get_field_at(self.val.type, field).name == name:
+                return i
+        return None
+
+
+# ------------------------------------------------------------------------------
+# Primitive Values
+#
+# Slices of primitives are decoded straight from memory, without an SBValue per element.
+# The text has to match what LLDB shows for the element:
+#    1 byte types (u8, bool, b8) use a table formatted by LLDB itself,
+#    wider integers are plain decimals,
+#    floats emulate llvm::APFloat::toString, which LLDB uses.
+# The result is compared against LLDB on a few probe values once per type,
+# types that don't match keep going through SBValues.
+
+# Decodes and formats the element starting at the given offset of the buffer
+Primitive_Format = Callable[[bytes, int], str]
+
+PRIMITIVE_FORMATS: dict[str, Primitive_Format | None] = {}
+
+# target.max-zero-padding-in-float-format
+FLOAT_MAX_ZERO_PADDING = 6
+
+FLOAT_PROBES = (0.0, -0.0, 1.0, -2.5, 3.14, 0.1, 1e-7, 1e7, 123456.789, 1e10, 1e-40, 3e38, float("inf"))
+
+def format_value_with_lldb(v: lldb.SBValue, t: lldb.SBType, raw: bytes) -> str:
+    return value_summary(value_from_bytes(v, "probe", raw, t))
+
+def format_float(bits: int, size: int) -> str:
+    """Port of llvm::APFloat::toString(FormatPrecision=0) for IEEE single and double floats."""
+
+    mantissa_bits, exponent_bits = (23, 8) if size == 4 else (52, 11)
+    precision = mantissa_bits + 1
+    bias      = (1 << (exponent_bits - 1)) - 1
+
+    sign           = "-" if bits >> (mantissa_bits + exponent_bits) else ""
+    exponent_field = (bits >> mantissa_bits) & ((1 << exponent_bits) - 1)
+    mantissa       = bits & ((1 << mantissa_bits) - 1)
+
+    if exponent_field == (1 << exponent_bits) - 1:
+        if mantissa != 0:
+            return "NaN"
+        return "-Inf" if sign else "+Inf"
+
+    if exponent_field == 0 and mantissa == 0:
+        return sign + "0"
+
+    if exponent_field == 0: # denormal
+        significand = mantissa
+        exp         = 1 - bias - mantissa_bits
+    else:
+        significand = mantissa | (1 << mantissa_bits)
+        exp         = exponent_field - bias - mantissa_bits
+
+    format_precision = 2 + precision * 59 // 196
+
+    # ignore trailing binary zeros
+    trailing = (significand & -significand).bit_length() - 1
+    exp         += trailing
+    significand >>= trailing
+
+    # change the exponent from 2^e to 10^e
+    if exp > 0:
+        significand <<= exp
+        exp = 0
+    elif exp < 0:
+        significand *= 5 ** -exp
+
+    # drop the digits that can't affect the result
+    bits_required = (format_precision * 196 + 58) // 59
+    active_bits   = significand.bit_length()
+    if active_bits > bits_required:
+        tens_removable = (active_bits - bits_required) * 59 // 196
+        if tens_removable > 0:
+            exp += tens_removable
+            significand //= 10 ** tens_removable
+
+    digits = str(significand)
+    stripped = digits.rstrip("0")
+    exp   += len(digits) - len(stripped)
+    digits = stripped
+
+    # round half up to the format precision
+    if len(digits) > format_precision:
+        first = len(digits) - format_precision
+        kept  = digits[:format_precision]
+        exp  += first
+        if digits[format_precision] >= "5":
+            kept = str(int(kept) + 1)
+            if len(kept) > format_precision:
+                kept = kept[:-1]
+                exp += 1
+        stripped = kept.rstrip("0")
+        exp   += len(kept) - len(stripped)
+        digits = stripped
+
+    n_digits = len(digits)
+
+    if exp >= 0:
+        scientific = exp > FLOAT_MAX_ZERO_PADDING or n_digits + exp > format_precision
+    else:
+        msd = exp + n_digits - 1
+        scientific = msd < 0 and -msd > FLOAT_MAX_ZERO_PADDING
+
+    if scientific:
+        exp += n_digits - 1
+        mantissa_str = digits[0] + "." + (digits[1:] or "0")
+        return f"{sign}{mantissa_str}E{'+' if exp >= 0 else '-'}{abs(exp)}"
+
+    if exp >= 0:
+        return sign + digits + "0" * exp
+
+    whole_digits = exp + n_digits
+    if whole_digits > 0:
+        return sign + digits[:whole_digits] + "." + digits[whole_digits:]
+
+    return sign + "0." + "0" * -whole_digits + digits
+
+def compile_primitive_format(v: lldb.SBValue, t: lldb.SBType) -> Primitive_Format | None:
+
+    # distinct types are typedefs, they are still compared against LLDB as themselves
+    base = t.GetCanonicalType()
+    if base.type != lldb.eTypeClassBuiltin:
+        return None
+
+    size   = base.size
+    flags  = base.GetTypeFlags()
+    endian = "<" if v.process.GetByteOrder() == lldb.eByteOrderLittle else ">"
+
+    if size == 1:
+        table = [format_value_with_lldb(v, t, bytes([b])) for b in range(256)]
+        return lambda data, offset: table[data[offset]]
+
+    if flags & lldb.eTypeIsInteger and size in (2, 4, 8):
+        code = {2: "h", 4: "i", 8: "q"}[size]
+        if not flags & lldb.eTypeIsSigned:
+            code = code.upper()
+
+        unpack_int = struct.Struct(endian + code).unpack_from
+        fmt: Primitive_Format = lambda data, offset: str(unpack_int(data, offset)[0])
+        probes = [struct.pack(endian + code, x) for x in (0, 1, 127, 1000000)]
+
+    elif flags & lldb.eTypeIsFloat and size in (4, 8):
+        code = "I" if size == 4 else "Q"
+
+        unpack_bits = struct.Struct(endian + code).unpack_from
+        fmt = lambda data, offset: format_float(unpack_bits(data, offset)[0], size)
+        probes = [struct.pack(endian + ("f" if size == 4 else "d"), x) for x in FLOAT_PROBES]
+
+    else:
+        return None
+
+    for probe in probes:
+        if fmt(probe, 0) != format_value_with_lldb(v, t, probe):
+            return None
+
+    return fmt
+
+def primitive_format(v: lldb.SBValue, t: lldb.SBType) -> Primitive_Format | None:
+    """Returns the cached raw memory formatter for the type, if it has one."""
+
+    if t.name in PRIMITIVE_FORMATS:
+        return PRIMITIVE_FORMATS[t.name]
+
+    fmt = compile_primitive_format(v, t)
+    PRIMITIVE_FORMATS[t.name] = fmt
+    return fmt
+
+
+# ------------------------------------------------------------------------------
+# Plain Data Values
+#
+# Structs and fixed arrays made only of primitives, enums and other plain data
+# (vectors, transforms, handles) are formatted from a single read of their bytes,
+# with the offset and format of every field compiled once per type.
+# The items go through aggregate_value_summary like SBValue children do,
+# so the text, and where it gets cut, is the same.
+
+# Decodes and formats the value starting at the given offset of the buffer, within a budget
+Plain_Format = Callable[[bytes, int, int | None], str]
+
+PLAIN_FORMATS: dict[str, Plain_Format | None] = {}
+
+def plain_aggregate(
+    prefix:  str,
+    fields:  list[tuple[int, Plain_Format]], # (offset, format)
+    data:    bytes,
+    offset:  int,
+    budget:  int | None,
+) -> str:
+    global summary_budget
+
+    # same as value_summary, the budget is read by aggregate_value_summary
+    outer_budget   = summary_budget
+    summary_budget = budget
+    try:
+        return aggregate_value_summary(prefix, "}",
+            get_value=lambda i, item_budget: fields[i][1](data, offset + fields[i][0], item_budget),
+            length=len(fields),
+        )
+    finally:
+        summary_budget = outer_budget
+
+def compile_enum_format(v: lldb.SBValue, t: lldb.SBType) -> Plain_Format | None:
+    int_type = t.GetEnumerationIntegerType()
+    if not int_type.IsValid() or t.size not in (1, 2, 4, 8):
+        return None
+
+    # enum_summary reads the value as an int64
+    code = {1: "b", 2: "h", 4: "i", 8: "q"}[t.size]
+    if t.size < 8 and not int_type.GetTypeFlags() & lldb.eTypeIsSigned:
+        code = code.upper()
+
+    endian = "<" if v.process.GetByteOrder() == lldb.eByteOrderLittle else ">"
+    unpack = struct.Struct(endian + code).unpack_from
+    names  = enum_names(t)
+
+    def fmt(data: bytes, offset: int, budget: int | None) -> str:
+        num = unpack(data, offset)[0]
+        return names.get(num) or str(num)
+
+    return fmt
+
+def compile_plain_format(v: lldb.SBValue, t: lldb.SBType) -> Plain_Format | None:
+
+    odin_type = get_odin_type(t)
+
+    if odin_type == Odin_Type.ENUM:
+        return compile_enum_format(v, t)
+
+    if odin_type == Odin_Type.STRUCT and t.type == lldb.eTypeClassStruct:
+        fields = []
+        for i in range(t.GetNumberOfFields()):
+            field = type_get_field_at(t, i)
+            fmt   = None if field.IsBitfield() else plain_format(v, field.type)
+            if fmt is None:
+                return None
+            fields.append((field.GetOffsetInBytes(), fmt))
+
+        return lambda data, offset, budget: plain_aggregate("{", fields, data, offset, budget)
+
+    if odin_type == Odin_Type.ARRAY:
+        elem_type = t.GetArrayElementType()
+        fmt       = plain_format(v, elem_type)
+        if fmt is None or elem_type.size == 0:
+            return None
+
+        length = t.size // elem_type.size
+        fields = [(i * elem_type.size, fmt) for i in range(length)]
+
+        return lambda data, offset, budget: plain_aggregate(f"[{length}]{{", fields, data, offset, budget)
+
+    primitive = primitive_format(v, t)
+    if primitive is None:
+        return None
+
+    return lambda data, offset, budget: primitive(data, offset)
+
+def plain_format(v: lldb.SBValue, t: lldb.SBType) -> Plain_Format | None:
+    """Returns the cached raw memory formatter for plain data types, None for other types."""
+
+    # anonymous types can't be told apart
+    if not t.name:
+        return None
+
+    if t.name in PLAIN_FORMATS:
+        return PLAIN_FORMATS[t.name]
+
+    # a type containing itself (through a pointer) is not plain anyway
+    PLAIN_FORMATS[t.name] = None
+
+    fmt = compile_plain_format(v, t)
+    PLAIN_FORMATS[t.name] = fmt
+    return fmt
+
+def value_bytes(v: lldb.SBValue) -> bytes | None:
+    """The bytes of the value, read through the memory cache if it is in memory."""
+    addr = v.load_addr
+    if addr != lldb.LLDB_INVALID_ADDRESS:
+        return read_memory(v.process, addr, v.size)
+
+    error = lldb.SBError()
+    data  = v.GetData().ReadRawData(error, 0, v.size)
+    return data if error.success else None
+
+def plain_summary(v: lldb.SBValue) -> str | None:
+    """Summary of a plain data value from one read, None if it isn't plain data."""
+    fmt = plain_format(v, v.type)
+    if fmt is None:
+        return None
+
+    data = value_bytes(v)
+    if data is None:
+        return None
+
+    return fmt(data, 0, summary_budget)
 
 
 # ------------------------------------------------------------------------------
@@ -183,19 +971,76 @@ def get_cap(v: lldb.SBValue) -> int:
 def get_data(v: lldb.SBValue) -> lldb.SBValue:
     return value_get_child(v.GetNonSyntheticValue(), "data")
 
+@cached_summary
 def slice_summary(v: lldb.SBValue, _dict) -> str:
 
     length = get_len(v)
 
-    # GetChildAtIndex goes through Slice_Children_Provider
-    if length > SLICE_CHUNK_SIZE:
-        get_value = lambda i: value_summary(v.GetChildAtIndex(i // SLICE_CHUNK_SIZE) \
-                                             .GetChildAtIndex(i % SLICE_CHUNK_SIZE))
-    else:
-        get_value = lambda i: value_summary(v.GetChildAtIndex(i))
+    get_value = plain_slice_values(v, length)
+    if get_value is None:
+        get_value = lambda i, budget: value_summary(slice_element(v, i), budget)
 
     return aggregate_value_summary(f"[{length}]{{", "}", get_value, length)
 
+def plain_slice_values(v: lldb.SBValue, length: int) -> Callable[[int, int | None], str] | None:
+    """
+    Reads the part of a slice of plain data that fits in the summary with one memory read,
+    elements past it are read one by one. Returns None if the elements aren't plain data.
+    """
+    if length <= 0:
+        return None
+
+    data      = get_data(v)
+    elem_type = data.type.GetPointeeType()
+
+    fmt = plain_format(v, elem_type)
+    if fmt is None:
+        return None
+
+    # every element takes at least one character and a separator
+    count = min(length, AGGREGATE_SUMMARY_MAX_LEN // 3 + 2)
+    size  = elem_type.size
+
+    buffer = read_memory(v.process, data.GetValueAsUnsigned(0), count * size)
+    if buffer is None:
+        return None
+
+    def get_value(i: int, budget: int | None) -> str:
+        if i < count:
+            return fmt(buffer, i * size, budget)
+        return value_summary(slice_element(v, i), budget)
+
+    return get_value
+
+def slice_element(v: lldb.SBValue, idx: int) -> lldb.SBValue:
+    data      = get_data(v)
+    elem_type = data.type.GetPointeeType()
+    return data.CreateChildAtOffset(f"[{idx}]", idx * elem_type.size, elem_type)
+
+# Long slices are split into ranges of at most SLICE_CHUNK_SIZE children per level:
+#
+#    s                      [100000000]{...}
+#        [0..<1000000]      sub-slice with data and len pointing at the range
+#            [0..<1000]     T[1000] array, its elements are native array children
+#            [1000..<2000]
+#        [1000000..<2000000]
+#
+# A sub-slice gets the same provider, which reads its first index from the range name.
+#
+# The elements are hidden children past the ranges, child i is element i from
+# chunked_len on, so `s[i]` indexing by position reaches the element (while `s[0]`
+# is the first range). The first chunked_len elements come after the others.
+
+CHUNK_NAME_RE   = re.compile(r"^\[(\d+)\.\.<(\d+)\]$")
+ELEMENT_NAME_RE = re.compile(r"^\[(\d+)\]$")
+
+def chunk_span(length: int) -> int:
+    """Number of elements in each child range, 1 if the elements are listed directly."""
+    span = 1
+    while math.ceil(length / span) > SLICE_CHUNK_SIZE:
+        span *= SLICE_CHUNK_SIZE
+    return span
+
 class Slice_Children_Provider(lldb.SBSyntheticValueProvider):
 
     def __init__(self, val: lldb.SBValue, _dict) -> None:
@@ -206,7 +1051,18 @@ class Slice_Children_Provider(lldb.SBSyntheticValueProvider):
         self.data = get_data(self.val)
         assert self.data.type.is_pointer
 
-        self.chunked_len = 0 if not self.len > SLICE_CHUNK_SIZE else math.ceil(self.len / SLICE_CHUNK_SIZE)
+        self.elem_type = self.data.type.GetPointeeType()
+        self.update_chunks()
+
+    def update_chunks(self) -> None:
+        self.span        = chunk_span(self.len)
+        self.chunked_len = 0 if self.span == 1 else math.ceil(self.len / self.span)
+
+        # sub-slices created for a range are named after it
+        self.base = 0
+        match = CHUNK_NAME_RE.match(self.val.GetName() or "")
+        if match and int(match[2]) - int(match[1]) == self.len:
+            self.base = int(match[1])
 
     def has_children(self) -> bool:
         return self.len > 0
@@ -214,36 +1070,266 @@ class Slice_Children_Provider(lldb.SBSyntheticValueProvider):
     def num_children(self) -> int:
         return self.chunked_len if self.chunked_len > 0 else self.len
 
+    def get_child_index(self, name: str) -> int | None:
+        # `[i]` of an element, with i counted from the start of the whole slice,
+        # elements of a chunked slice are hidden children after the ranges
+        match = ELEMENT_NAME_RE.match(name)
+        if match:
+            idx = int(match[1]) - self.base
+            if not 0 <= idx < self.len:
+                return None
+            return idx if idx >= self.chunked_len else self.len + idx
+
+        # `[start..<end]` of a range, it has to be one of the children
+        match = CHUNK_NAME_RE.match(name)
+        if match and self.chunked_len > 0:
+            start = int(match[1]) - self.base
+            end   = int(match[2]) - self.base
+            if start >= 0 and start % self.span == 0 and end == min(start + self.span, self.len):
+                return start // self.span
+
+        return None
+
     def get_child_at_index(self, idx: int) -> lldb.SBValue:
-        length = self.num_children()
-        assert idx >= 0 and idx < length
+        assert idx >= 0 and idx < self.chunked_len + self.len
 
-        pointee = self.data.deref
+        if idx >= self.len:
+            return self.element(idx - self.len)
+        if idx >= self.chunked_len:
+            return self.element(idx)
 
-        if self.chunked_len > 0:
-            array_len   = min(SLICE_CHUNK_SIZE, self.len - idx * SLICE_CHUNK_SIZE)
-            range_start = idx * SLICE_CHUNK_SIZE
-            name        = f"[{range_start}..<{range_start+array_len}]"
-            offset      = idx * pointee.size * SLICE_CHUNK_SIZE
-            type        = pointee.type.GetArrayType(array_len)
-        else:
-            name        = f"[{idx}]"
-            offset      = idx * pointee.size
-            type        = pointee.type
+        range_start = idx * self.span
+        range_len   = min(self.span, self.len - range_start)
+        name        = f"[{self.base + range_start}..<{self.base + range_start + range_len}]"
+
+        if self.span == SLICE_CHUNK_SIZE:
+            return self.leaf_range(name, range_start, range_len)
+
+        return self.sub_slice(name, range_start, range_len)
+
+    def element(self, idx: int) -> lldb.SBValue:
+        return self.data.CreateChildAtOffset(f"[{self.base + idx}]", idx * self.elem_type.size, self.elem_type)
+
+    def leaf_range(self, name: str, start: int, length: int) -> lldb.SBValue:
+        """T[n] array of the range, its elements are native array children."""
+        offset = start * self.elem_type.size
+        return self.data.CreateChildAtOffset(name, offset, self.elem_type.GetArrayType(length))
+
+    def sub_slice(self, name: str, start: int, length: int) -> lldb.SBValue:
+        pointer = self.data.GetValueAsUnsigned(0) + start * self.elem_type.size
+        return header_copy(self.val, name, {"data": pointer, "len": length})
+
+def header_copy(val: lldb.SBValue, name: str, fields: dict[str, int]) -> lldb.SBValue:
+    """Copy of a slice-like header with the given integer (or pointer) fields replaced."""
+    base    = val.GetNonSyntheticValue()
+    process = base.process
+    error   = lldb.SBError()
+
+    header = bytearray(base.GetData().ReadRawData(error, 0, base.size))
+    order  = "little" if process.GetByteOrder() == lldb.eByteOrderLittle else "big"
+
+    for i in range(base.type.GetNumberOfFields()):
+        field = type_get_field_at(base.type, i)
+        if field.name in fields:
+            size  = field.type.size
+            value = fields[field.name] & ((1 << (size*8)) - 1)
+            header[field.byte_offset:field.byte_offset + size] = value.to_bytes(size, order)
+
+    return value_from_bytes(val, name, bytes(header), base.type)
+
+def value_from_bytes(v: lldb.SBValue, name: str, raw: bytes, t: lldb.SBType) -> lldb.SBValue:
+    process = v.process
+    error   = lldb.SBError()
+    data    = lldb.SBData()
+    data.SetData(error, raw, process.GetByteOrder(), process.GetAddressByteSize())
+    return v.CreateValueFromData(name, data, t)
+
+
+# ------------------------------------------------------------------------------
+# SOA Slice Values
+#
+# #soa[]T and #soa[dynamic]T keep a pointer per field of T, followed by the length:
+#
+#    #soa[dynamic]Foo :: struct {
+#        foo_name:  [^]string,
+#        value:     [^]int,
+#        __$len:    int,
+#        __$cap:    int,
+#        allocator: runtime.Allocator,
+#    }
+#
+# Rows are shown as T values, put together from one read per column for every range of rows.
+# Ranges are chunked like slices, a sub-range is a copy of the header with the pointers advanced.
+
+SOA_LEN_FIELD = "__$len"
+SOA_NAME_RE   = re.compile(r"^#soa\[(?:dynamic)?\](.+)$")
+
+# soa type name -> T, None if it can't be found
+SOA_ELEM_TYPES: dict[str, lldb.SBType | None] = {}
+
+def type_is_soa_slice(t: lldb.SBType) -> bool:
+    return any(type_get_field_at(t, i).name == SOA_LEN_FIELD for i in range(t.GetNumberOfFields()))
+
+def soa_elem_type(v: lldb.SBValue) -> lldb.SBType | None:
+    name = v.type.name
+    if name not in SOA_ELEM_TYPES:
+        elem_type = None
+        match = SOA_NAME_RE.match(name)
+        if match:
+            found = v.target.FindFirstType(match[1])
+            if found.IsValid():
+                elem_type = found
+        SOA_ELEM_TYPES[name] = elem_type
+    return SOA_ELEM_TYPES[name]
+
+class Soa_Column:
+    def __init__(self, name: str, pointer: int, size: int, offset: int) -> None:
+        self.name    = name
+        self.pointer = pointer
+        self.size    = size   # size of the field
+        self.offset  = offset # offset of the field in T
+
+def soa_columns(v: lldb.SBValue, elem_type: lldb.SBType) -> list[Soa_Column] | None:
+    offsets = {}
+    for i in range(elem_type.GetNumberOfFields()):
+        field = type_get_field_at(elem_type, i)
+        offsets[field.name] = field.byte_offset
+
+    columns = []
+    for i in range(v.num_children):
+        child = v.GetChildAtIndex(i)
+        if child.name == SOA_LEN_FIELD:
+            return columns
+        if child.name not in offsets or not child.type.is_pointer:
+            return None
+        columns.append(Soa_Column(child.name, child.GetValueAsUnsigned(0), child.type.GetPointeeType().size, offsets[child.name]))
+
+    return None
+
+@cached_summary
+def soa_summary(v: lldb.SBValue, _dict) -> str:
+    rows = Soa_Children_Provider(v.GetNonSyntheticValue(), _dict)
+    rows.update()
+    # without T or with a negative length, like a broken string
+    if rows.columns is None:
+        return struct_summary(v, _dict)
+
+    # every row takes at least one character and a separator
+    count = min(rows.len, AGGREGATE_SUMMARY_MAX_LEN // 3 + 2)
+    page  = rows.read_rows(0, count)
+    size  = rows.elem_type.size
+    if page is None:
+        return "<error reading #soa rows>"
+
+    fmt = plain_format(v, rows.elem_type)
+
+    def get_value(i: int, budget: int | None) -> str:
+        # rows past the summary's read are read on their own
+        row, offset = (page, i * size) if i < count else (rows.read_rows(i, 1), 0)
+        if row is None:
+            return "<error reading #soa rows>"
+
+        if fmt is not None:
+            return fmt(row, offset, budget)
+        return value_summary(value_from_bytes(v, f"[{i}]", row[offset:offset + size], rows.elem_type), budget)
+
+    return aggregate_value_summary(f"[{rows.len}]{{", "}", get_value, rows.len)
+
+class Soa_Children_Provider(Slice_Children_Provider):
+
+    def update(self) -> None:
+        val = self.val.GetNonSyntheticValue()
 
-        return self.data.CreateChildAtOffset(name, offset, type)
+        self.len       = value_get_child(val, SOA_LEN_FIELD).signed
+        self.elem_type = soa_elem_type(val)
+        self.columns   = soa_columns(val, self.elem_type) if self.elem_type else None
+        self.page      = None
+
+        # without T (or with a broken length) the fields are shown as they are
+        if self.len < 0:
+            self.columns = None
+        if self.columns is None:
+            self.len = val.num_children
+
+        self.update_chunks()
+
+    def element(self, idx: int) -> lldb.SBValue:
+        if self.columns is None:
+            return self.val.GetNonSyntheticValue().GetChildAtIndex(idx)
+
+        name = f"[{self.base + idx}]"
+
+        # an element looked up by name in a chunked #soa
+        if self.chunked_len > 0:
+            row = self.read_rows(idx, 1)
+            if row is None:
+                return self.unreadable_rows(name, idx, 1, self.elem_type)
+            return value_from_bytes(self.val, name, row, self.elem_type)
+
+        # all rows fit in one page
+        if self.page is None:
+            self.page = self.read_rows(0, self.len)
+            if self.page is None:
+                return self.unreadable_rows(name, idx, 1, self.elem_type)
+
+        size = self.elem_type.size
+        return value_from_bytes(self.val, name, self.page[idx*size:(idx+1)*size], self.elem_type)
+
+    def leaf_range(self, name: str, start: int, length: int) -> lldb.SBValue:
+        array_type = self.elem_type.GetArrayType(length)
+
+        rows = self.read_rows(start, length)
+        if rows is None:
+            return self.unreadable_rows(name, start, length, array_type)
+        return value_from_bytes(self.val, name, rows, array_type)
+
+    def sub_slice(self, name: str, start: int, length: int) -> lldb.SBValue:
+        fields = {column.name: column.pointer + start * column.size for column in self.columns}
+        fields[SOA_LEN_FIELD] = length
+        return header_copy(self.val, name, fields)
+
+    def read_rows(self, start: int, count: int) -> bytes | None:
+        """
+        Bytes of `count` T values from `start`, with one memory read per column.
+        Returns None if a column can't be read.
+        """
+        size = self.elem_type.size
+        rows = bytearray(count * size)
+
+        for column in self.columns:
+            data = read_memory(self.val.process, column.pointer + start * column.size, count * column.size)
+            if data is None:
+                return None
+            # scatter every byte of the field with a strided slice assignment
+            for b in range(column.size):
+                rows[column.offset + b::size] = data[b::column.size]
+
+        return bytes(rows)
+
+    def unreadable_rows(self, name: str, start: int, count: int, t: lldb.SBType) -> lldb.SBValue:
+        """The rows as a value at the column that can't be read, LLDB shows the read error."""
+        for column in self.columns:
+            address = column.pointer + start * column.size
+            if read_memory(self.val.process, address, count * column.size) is None:
+                break
+        return self.val.CreateValueFromAddress(name, address, t)
 
 
 # ------------------------------------------------------------------------------
 # Array Values
 
+@cached_summary
 def array_summary(v: lldb.SBValue, _dict) -> str:
     v = v.GetNonSyntheticValue() if v.IsSynthetic() else v
 
+    summary = plain_summary(v)
+    if summary is not None:
+        return summary
+
     length = v.num_children
 
     return aggregate_value_summary(f"[{length}]{{", "}",
-        get_value=lambda i: value_summary(v.GetChildAtIndex(i)),
+        get_value=lambda i, budget: value_summary(v.GetChildAtIndex(i), budget),
         length=length,
     )
 
@@ -259,6 +1345,59 @@ def array_summary(v: lldb.SBValue, _dict) -> str:
 # 
 # Odin strings are UTF-8 encoded
 
+def read_string(
+    process:   lldb.SBProcess,
+    pointer:   int,
+    length:    int | None,
+    max_chars: int | None = None,
+) -> tuple[str, bool] | None:
+    """
+    Decodes at most STRING_SUMMARY_MAX_BYTES of UTF-8 text, reading it chunk by chunk.
+    Without a length (cstring) reading stops at the NUL terminator.
+    Reading also stops once more than max_chars characters are decoded.
+    A codepoint cut by the byte budget is dropped, invalid bytes are shown as escapes.
+    Returns the text and whether it was truncated, or None if nothing could be read.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")("backslashreplace")
+    parts   = []
+    chars   = 0
+    read    = 0
+    limit   = STRING_SUMMARY_MAX_BYTES if length is None else min(length, STRING_SUMMARY_MAX_BYTES)
+
+    while read < limit and (max_chars is None or chars <= max_chars):
+        # chunks end on aligned addresses, so a cstring read doesn't cross into unmapped memory
+        addr = pointer + read
+        size = min(STRING_READ_CHUNK_SIZE - addr % STRING_READ_CHUNK_SIZE, limit - read)
+        if max_chars is not None:
+            # every character takes at least one byte
+            size = min(size, max_chars - chars + 1)
+
+        data = read_memory(process, addr, size)
+        if data is None:
+            if read == 0:
+                return None
+            break
+
+        if length is None:
+            nul = data.find(0)
+            if nul != -1:
+                parts.append(decoder.decode(data[:nul], final=True))
+                return "".join(parts), False
+
+        read += len(data)
+        text  = decoder.decode(data, final=read == length)
+        chars += len(text)
+        parts.append(text)
+
+    return "".join(parts), read != length
+
+def summary_max_chars(quotes: int) -> int | None:
+    """Characters of text that fit in the summary budget, given the number of characters around it."""
+    if summary_budget is None:
+        return None
+    return max(summary_budget - quotes, 0)
+
+@cached_summary
 def string_summary(v: lldb.SBValue, _dict) -> str:
 
     length  = get_len(v)
@@ -266,39 +1405,97 @@ def string_summary(v: lldb.SBValue, _dict) -> str:
         return '""'
 
     pointer = get_data(v).GetValueAsUnsigned(0)
-    if pointer == 0:
+    if pointer == 0 or length < 0:
         return struct_summary(v, _dict)
 
-    error = lldb.SBError()
-    string_data = v.process.ReadMemory(pointer, length, error)
-    if not error.success:
-        print(f"Error reading string data: {error}")
+    string = read_string(v.process, pointer, length, summary_max_chars(2))
+    if string is None:
+        print(f"Error reading string data at 0x{pointer:x}")
         return "<error reading string>"
 
-    return '"{}"'.format(string_data.decode("utf-8"))
+    text, truncated = string
+    if truncated:
+        return f'"{text}"...(len={length})'
+
+    return f'"{text}"'
+
+
+# ------------------------------------------------------------------------------
+# CString Values
+#
+# cstring is a pointer to NUL terminated UTF-8 data
+
+@cached_summary
+def cstring_summary(v: lldb.SBValue, _dict) -> str:
+
+    pointer = v.GetValueAsUnsigned(0)
+    if pointer == 0:
+        return "nil"
+
+    string = read_string(v.process, pointer, None, summary_max_chars(2))
+    if string is None:
+        return f"cstring(0x{pointer:x})"
+
+    text, truncated = string
+    if truncated:
+        return f'"{text}"...'
+
+    return f'"{text}"'
 
 
 # ------------------------------------------------------------------------------
 # Map Values
 
+@cached_summary
 def map_summary(v: lldb.SBValue, _dict) -> str:
 
     length = get_len(v)
     if length == 0:
         return "map[0]{}"
 
+    entries = Map_Children_Provider(v.GetNonSyntheticValue(), _dict)
+    entries.update()
+
+    def get_value(i: int, budget: int | None) -> str:
+        key = value_summary(entries.get_key(i), budget)
+        if budget is not None:
+            budget -= len(key) + 3
+        return f"{key} = {value_summary(entries.get_value(i), budget)}"
+
     return aggregate_value_summary(
         f"map[{length}]{{", "}",
-        get_value=lambda i: f"{value_summary(v.GetChildAtIndex(i*2))} = {value_summary(v.GetChildAtIndex(i*2 + 1))}",
-        length=length,
+        get_value=get_value,
+        length=len(entries.slots),
     )
 
+MAP_HASH_SIZE      = 8 # Odin uses 64-bit hashes
+MAP_KEY_NAME_RE    = re.compile(r"^key(\d+)$")
+MAP_TOMBSTONE_MASK = 1 << (MAP_HASH_SIZE*8 - 1)
+
+def map_live_slots(process: lldb.SBProcess, hash_ptr: int, cap: int) -> array.array:
+    """
+    Reads the whole hash array with a single memory read
+    and returns the indices of the occupied slots (skipping empty and tombstone hashes).
+    """
+    slots = array.array("q")
+
+    data = read_memory(process, hash_ptr, cap * MAP_HASH_SIZE)
+    if data is None:
+        return slots
+
+    hashes = array.array("Q", data)
+    if not process_is_native_endian(process):
+        hashes.byteswap()
+
+    slots.extend(i for i, h in enumerate(hashes) if 0 < h < MAP_TOMBSTONE_MASK)
+    return slots
+
 class Map_Children_Provider:
 
     def __init__(self, val, dict) -> None:
         self.val = val
 
-    def update(self) -> None:
+    def read_layout(self) -> None:
         data = get_data(self.val)
 
         hash_field = value_get_child(data, "hash")
@@ -308,11 +1505,12 @@ class Map_Children_Provider:
         self.key_type = value_get_child(data, "key").type
         self.val_type = value_get_child(data, "value").type
 
+        self.len     = get_len(self.val)
         self.key_ptr = data.unsigned & ~63
         cap_log2     = data.unsigned & 63
         self.cap     = 1 << cap_log2 if cap_log2 > 0 else 0
 
-        assert hash_field.size == 8 # Odin uses 64-bit hashes
+        assert hash_field.size == MAP_HASH_SIZE
 
         self.key_cell_info = cell_info(self.key_type, key_cell)
         self.val_cell_info = cell_info(self.val_type, value_cell)
@@ -320,17 +1518,23 @@ class Map_Children_Provider:
         self.val_ptr  = cell_index(self.key_ptr, self.key_cell_info, self.cap)
         self.hash_ptr = cell_index(self.val_ptr, self.val_cell_info, self.cap)
 
+    def update(self) -> None:
+        self.read_layout()
+
+        # indices of the occupied slots, in slot order
+        process    = self.val.process
+        self.slots = STOP_CACHE.get(process, ("map_live_slots", self.hash_ptr, self.cap),
+                                    lambda: map_live_slots(process, self.hash_ptr, self.cap))
+
     def num_children(self):
-        return get_len(self.val)*2 + 2
+        return self.len*2 + 2
 
     def get_child_at_index(self, index):
 
-        error = lldb.SBError()
-        
         # Second to last one: length
         if index == self.num_children()-2:
             int_type = value_get_child(self.val, "len").type
-            len_data = lldb.SBData.CreateDataFromInt(get_len(self.val), int_type.GetByteSize())
+            len_data = lldb.SBData.CreateDataFromInt(self.len, int_type.GetByteSize())
             return self.val.CreateValueFromData("len", len_data, int_type)
 
         # Last one: capacity
@@ -338,37 +1542,328 @@ class Map_Children_Provider:
             int_type = value_get_child(self.val, "len").type
             cap_data = lldb.SBData.CreateDataFromInt(self.cap, int_type.GetByteSize())
             return self.val.CreateValueFromData("cap", cap_data, int_type)
-        
+
         entry_idx = index // 2
         wants_key = index % 2 == 0
 
-        key_index = 0
-        for i in range(self.cap):
-            size_of_hash = 8  # Odin uses 64-bit hashes
-            tombstone_mask = 1 << (size_of_hash*8 - 1)
+        if entry_idx >= len(self.slots):
+            return None
+
+        key_val = self.get_key(entry_idx)
+        if wants_key:
+            return key_val
+
+        return self.get_value(entry_idx, f"[{value_summary(key_val)}]")
+
+    def get_child_index(self, name: str) -> int | None:
+        if name == "len": return self.num_children()-2
+        if name == "cap": return self.num_children()-1
+
+        match = MAP_KEY_NAME_RE.match(name)
+        if match:
+            entry_idx = int(match[1])
+            return entry_idx*2 if entry_idx < len(self.slots) else None
+
+        # value children are named after their key, e.g. `m["key"]` or `m[42]`
+        if name.startswith("[") and name.endswith("]"):
+            key  = map_key_from_text(name[1:-1], self.key_type, self.val.process)
+            slot = self.find_slot(key) if key is not None else None
+            if slot is not None:
+                entry_idx = bisect.bisect_left(self.slots, slot)
+                if entry_idx < len(self.slots) and self.slots[entry_idx] == slot:
+                    return entry_idx*2 + 1
+
+            # keys that aren't literals (structs, escaped text) are matched by their summary
+            return self.key_summary_index().get(name[1:-1])
+
+        return None
+
+    def key_summary_index(self) -> dict[str, int]:
+        """Maps the summary of every key to the index of its value child, built once per stop."""
+        def build() -> dict[str, int]:
+            return {value_summary(self.get_key(i)): i*2 + 1 for i in range(len(self.slots))}
+
+        return STOP_CACHE.get(self.val.process, ("map_key_summary_index", self.key_ptr, self.cap), build)
+
+    def get_key(self, entry_idx: int) -> lldb.SBValue:
+        return self.slot_key(self.slots[entry_idx], f"key{entry_idx}")
+
+    def get_value(self, entry_idx: int, name: str = "value") -> lldb.SBValue:
+        return self.slot_value(self.slots[entry_idx], name)
+
+    def slot_key(self, slot: int, name: str = "key") -> lldb.SBValue:
+        offset_key = cell_index(self.key_ptr, self.key_cell_info, slot)
+        return self.val.CreateValueFromAddress(name, offset_key, self.key_type)
 
-            offset_hash = self.hash_ptr + i * size_of_hash
+    def slot_value(self, slot: int, name: str = "value") -> lldb.SBValue:
+        offset_value = cell_index(self.val_ptr, self.val_cell_info, slot)
+        return self.val.CreateValueFromAddress(name, offset_value, self.val_type)
 
-            hash_val = self.val.process.ReadUnsignedFromMemory(offset_hash, size_of_hash, error)
-            if not error.success:
-                print(error)
-                continue
-            elif hash_val == 0 or (hash_val & tombstone_mask) != 0:
-                continue
+    def read_hashes(self, start: int, count: int) -> array.array | None:
+        process = self.val.process
 
-            offset_key   = cell_index(self.key_ptr, self.key_cell_info, i)
-            offset_value = cell_index(self.val_ptr, self.val_cell_info, i)
+        data = read_memory(process, self.hash_ptr + start * MAP_HASH_SIZE, count * MAP_HASH_SIZE)
+        if data is None:
+            return None
 
-            if entry_idx == key_index:
-                key_val = self.val.CreateValueFromAddress(f"key{entry_idx}", offset_key, self.key_type)
-                if wants_key:
-                    return key_val
+        hashes = array.array("Q", data)
+        if not process_is_native_endian(process):
+            hashes.byteswap()
+        return hashes
 
-                return self.val.CreateValueFromAddress(f"[{value_summary(key_val)}]", offset_value, self.val_type)
+    def hash_seed(self) -> int | None:
+        """Seed of the key hashes, None if the stored hashes don't match the expected scheme."""
+        return STOP_CACHE.get(self.val.process, ("map_hash_seed", self.key_ptr, self.cap), self.find_hash_seed)
 
-            key_index += 1
+    def find_hash_seed(self) -> int | None:
+        # the seed is checked on the first occupied slot
+        for start in range(0, self.cap, MAP_PROBE_READ_SLOTS):
+            hashes = self.read_hashes(start, min(MAP_PROBE_READ_SLOTS, self.cap - start))
+            if hashes is None:
+                return None
 
-        print("not found")
+            for i, stored in enumerate(hashes):
+                if 0 < stored < MAP_TOMBSTONE_MASK:
+                    key = map_key_bytes(self.slot_key(start + i))
+                    if key is None:
+                        return None
+                    for seed in (splitmix64(self.key_ptr), 0):
+                        if map_hash_matches(stored, fnv1a_64(key, seed)):
+                            return seed
+                    return None
+
+        return None
+
+    def find_slot(self, key: bytes) -> int | None:
+        """
+        Returns the slot holding the key (as encoded by map_key_bytes), or None if there is none.
+        Probes from the key's hash like the Odin runtime does, reading only the probed slots.
+
+        Falls back to scan_slot when the seed can't be found: the first occupied slot's hash
+        matches neither seed (a map built by another runtime version or hasher),
+        or its hash or key can't be read. MAP_LOOKUPS counts both paths for odin-cache.
+        """
+        if self.len <= 0 or self.cap == 0:
+            return None
+
+        seed = self.hash_seed()
+        if seed is None:
+            MAP_LOOKUPS.scanned += 1
+            return self.scan_slot(key)
+
+        MAP_LOOKUPS.probed += 1
+
+        h    = fnv1a_64(key, seed)
+        mask = self.cap - 1
+        pos  = h & mask
+
+        probed = 0
+        while probed < self.cap:
+            count  = min(MAP_PROBE_READ_SLOTS, self.cap - pos)
+            hashes = self.read_hashes(pos, count)
+            if hashes is None:
+                return None
+
+            for i, stored in enumerate(hashes):
+                if stored == 0:
+                    return None
+                if stored < MAP_TOMBSTONE_MASK and map_hash_matches(stored, h) and map_key_bytes(self.slot_key(pos + i)) == key:
+                    return pos + i
+
+            probed += count
+            pos     = (pos + count) & mask
+
+        return None
+
+    def scan_slot(self, key: bytes) -> int | None:
+        """Fallback of find_slot comparing the key of every occupied slot."""
+        process = self.val.process
+        slots   = STOP_CACHE.get(process, ("map_live_slots", self.hash_ptr, self.cap),
+                                 lambda: map_live_slots(process, self.hash_ptr, self.cap))
+
+        for slot in slots:
+            if map_key_bytes(self.slot_key(slot)) == key:
+                return slot
+
+        return None
+
+# Odin hashes map keys with 64-bit FNV-1a, seeded per map with splitmix64 of its data pointer:
+#
+#    h := u64(seed) + 0xcbf29ce484222325
+#    for b in key_bytes { h = (h ~ u64(b)) * 0x100000001b3 }
+#
+# Strings hash their text, other keys the bytes of the value.
+# Lookups probe linearly from `h & (cap-1)` until an empty slot.
+# Stored hashes have the tombstone bit cleared, so it is ignored when comparing.
+
+FNV64_OFFSET = 0xcbf29ce484222325
+FNV64_PRIME  = 0x100000001b3
+U64_MASK     = (1 << 64) - 1
+
+# Hashes read at once while probing
+MAP_PROBE_READ_SLOTS = 64
+
+class Map_Lookups:
+    def __init__(self) -> None:
+        self.probed  = 0 # lookups that probed from the key's hash
+        self.scanned = 0 # lookups that compared every key, the hashes didn't match the scheme
+
+    def clear(self) -> None:
+        self.probed  = 0
+        self.scanned = 0
+
+MAP_LOOKUPS = Map_Lookups()
+
+def fnv1a_64(data: bytes, seed: int) -> int:
+    h = (seed + FNV64_OFFSET) & U64_MASK
+    for b in data:
+        h = ((h ^ b) * FNV64_PRIME) & U64_MASK
+    return h
+
+def splitmix64(x: int) -> int:
+    x = (x + 0x9e3779b97f4a7c15) & U64_MASK
+    x = ((x ^ (x >> 30)) * 0xbf58476d1ce4e5b9) & U64_MASK
+    x = ((x ^ (x >> 27)) * 0x94d049bb133111eb) & U64_MASK
+    return x ^ (x >> 31)
+
+def map_hash_matches(stored: int, h: int) -> bool:
+    return (stored ^ h) & ~MAP_TOMBSTONE_MASK == 0 or (h == 0 and stored == 1)
+
+# Longest cstring key that is compared
+MAP_CSTRING_KEY_MAX_BYTES = 1 << 20
+
+def read_cstring_bytes(process: lldb.SBProcess, pointer: int, max_bytes: int) -> bytes | None:
+    """Bytes before the NUL, or at least the first max_bytes of them. None if they can't be read."""
+    data = b""
+    while len(data) < max_bytes:
+        addr  = pointer + len(data)
+        chunk = read_memory(process, addr, STRING_READ_CHUNK_SIZE - addr % STRING_READ_CHUNK_SIZE)
+        if chunk is None:
+            return None
+        nul = chunk.find(0)
+        if nul != -1:
+            return data + chunk[:nul]
+        data += chunk
+    return data
+
+def map_key_bytes(key: lldb.SBValue) -> bytes | None:
+    """The bytes Odin hashes and compares for the key."""
+    odin_type = get_odin_type(key.type)
+
+    if odin_type == Odin_Type.STRING:
+        length = get_len(key)
+        if length < 0:
+            return None
+        return read_memory(key.process, get_data(key).GetValueAsUnsigned(0), length)
+
+    if odin_type == Odin_Type.CSTRING:
+        return read_cstring_bytes(key.process, key.GetValueAsUnsigned(0), MAP_CSTRING_KEY_MAX_BYTES)
+
+    error = lldb.SBError()
+    data  = key.GetData().ReadRawData(error, 0, key.size)
+    return data if error.success else None
+
+def map_key_from_text(
+    text:     str,
+    key_type: lldb.SBType,
+    process:  lldb.SBProcess,
+    frame:    lldb.SBFrame | None = None,
+) -> bytes | None:
+    """
+    Encodes a key written as an Odin literal (`"text"`, `42`, `true`, `.Member`)
+    or, if a frame is given, as an expression evaluated in it.
+    """
+    text      = text.strip()
+    odin_type = get_odin_type(key_type)
+    order     = "little" if process.GetByteOrder() == lldb.eByteOrderLittle else "big"
+
+    if odin_type in (Odin_Type.STRING, Odin_Type.CSTRING):
+        if len(text) >= 2 and text[0] == text[-1] == "`":
+            return text[1:-1].encode()
+        if len(text) >= 2 and text[0] == text[-1] == '"':
+            try:
+                literal = ast.literal_eval(text)
+                if isinstance(literal, str):
+                    return literal.encode("utf-8", "surrogateescape")
+            except (ValueError, SyntaxError):
+                pass
+
+    elif odin_type == Odin_Type.ENUM or key_type.type == lldb.eTypeClassBuiltin:
+        number = None
+
+        if odin_type == Odin_Type.ENUM:
+            name = text[1:] if text.startswith(".") else text
+            for member in key_type.GetEnumMembers():
+                if member.name == name:
+                    number = member.unsigned
+        elif text in ("true", "false"):
+            number = int(text == "true")
+
+        if number is None and key_type.GetTypeFlags() & lldb.eTypeIsFloat and key_type.size in (4, 8):
+            try:
+                return struct.pack(("<" if order == "little" else ">") + ("f" if key_type.size == 4 else "d"), float(text))
+            except ValueError:
+                pass
+
+        if number is None:
+            try:
+                number = int(text.replace("_", ""), 0)
+            except ValueError:
+                pass
+
+        if number is not None:
+            return (number & ((1 << (key_type.size*8)) - 1)).to_bytes(key_type.size, order)
+
+    if frame is None or not frame.IsValid():
+        return None
+
+    value = frame.EvaluateExpression(text)
+    if not value.IsValid() or value.GetError().Fail():
+        return None
+
+    if odin_type in (Odin_Type.STRING, Odin_Type.CSTRING) or value.size == key_type.size:
+        return map_key_bytes(value)
+
+    return None
+
+def map_get_command(
+    debugger: lldb.SBDebugger,
+    command:  str,
+    result:   lldb.SBCommandReturnObject,
+    _dict:    dict,
+) -> None:
+    """odin-map-get <map> <key> -- looks up a key without reading all entries of the map"""
+
+    args = command.strip().split(None, 1)
+    if len(args) < 2:
+        result.SetError("Usage: odin-map-get <map> <key>")
+        return
+
+    map_expr, key_expr = args
+    frame = debugger.GetSelectedTarget().GetProcess().GetSelectedThread().GetSelectedFrame()
+
+    map_val = frame.GetValueForVariablePath(map_expr)
+    if not map_val.IsValid():
+        map_val = frame.EvaluateExpression(map_expr)
+    if not map_val.IsValid() or get_odin_type(map_val.type) != Odin_Type.MAP:
+        result.SetError(f"'{map_expr}' is not a map")
+        return
+
+    entries = Map_Children_Provider(map_val.GetNonSyntheticValue(), _dict)
+    entries.read_layout()
+
+    key = map_key_from_text(key_expr, entries.key_type, map_val.process, frame)
+    if key is None:
+        result.SetError(f"Cannot use '{key_expr}' as a {type_display(entries.key_type)} key")
+        return
+
+    slot = entries.find_slot(key)
+    if slot is None:
+        result.AppendMessage(f"{key_expr} not found in {map_expr}")
+        return
+
+    key_val = entries.slot_key(slot)
+    result.AppendMessage(str(entries.slot_value(slot, f"[{value_summary(key_val)}]")))
 
 def cell_info(typev: lldb.SBType, cell_type: lldb.SBValue) -> 'Cell_Info':
     elements_per_cell = 0
@@ -376,7 +1871,7 @@ def cell_info(typev: lldb.SBType, cell_type: lldb.SBValue) -> 'Cell_Info':
     if typev.size != cell_type.size:
         array_type = cell_type.children[0].type
         if array_type.size > 0 and typev.size > 0:
-            elements_per_cell = array_type.size / typev.size
+            elements_per_cell = array_type.size // typev.size
 
     if elements_per_cell == 0:
         elements_per_cell = 1
@@ -416,6 +1911,344 @@ class Cell_Info:
         self.elements_per_cell = elements_per_cell
 
 
+# ------------------------------------------------------------------------------
+# Linked List Values
+#
+# `core:container/list` lists are shown as a flat array of their nodes:
+#
+#    list::List :: struct {head, tail: ^list::Node}
+#    list::Node :: struct {prev, next: ^list::Node}
+#
+# Nodes are usually embedded in another struct, `odin-list <Type> <field> <list>` shows the
+# elements of the lists named <list> (a variable or a field) as Type instead.
+# The same command marks a hand-rolled list (`next: ^Type`),
+# pointers to Type are then shown as the list that starts at that node.
+#
+# The children walk the whole list once per stop to count the nodes, checking for a cycle
+# with Floyd's algorithm and remembering every LIST_CHECKPOINT_NODES-th node.
+# A child is reached from the closest checkpoint (or from the previous child),
+# so a page of children costs at most LIST_CHECKPOINT_NODES more next pointers than its size.
+# Next pointers are read through the memory cache, nodes allocated close to each other
+# are fetched with the same page. Summaries only walk the first LIST_SUMMARY_MAX_NODES,
+# and leave the link field out of the elements: it only points to the next one.
+
+LIST_TYPE_NAME         = "list::List"
+LIST_NODE_TYPE_NAME    = "list::Node"
+LIST_CHECKPOINT_NODES  = 256
+LIST_SUMMARY_MAX_NODES = 100
+LIST_MAX_NODES         = 10_000_000 # a broken list is cut here
+
+class List_Link:
+    """How the nodes of a list are linked and what is shown for each of them."""
+
+    def __init__(
+        self,
+        element_type: lldb.SBType,
+        node_offset:  int,
+        next_offset:  int,
+        link_field:   int | None = None,
+    ) -> None:
+        self.element_type = element_type
+        self.node_offset  = node_offset # of the node in the element
+        self.next_offset  = next_offset # of the next pointer in the node
+        self.link_field   = link_field  # index of the node (or next) field in the element
+
+# list::List address -> (expression it was registered with, element of the list),
+# the elements hold a list::Node field. Other lists show their nodes.
+# Keyed by address rather than name: the same list is reached through pointers and
+# other names, and lists elsewhere with the same name hold other elements.
+LIST_NODE_ELEMENTS: dict[int, tuple[str, List_Link]] = {}
+
+# type name -> link of hand-rolled lists, pointers to these types are shown as lists
+LINKED_TYPES: dict[str, List_Link] = {}
+
+def list_link(v: lldb.SBValue) -> List_Link:
+    t = v.type
+    if t.is_pointer:
+        return LINKED_TYPES[t.GetPointeeType().name]
+
+    entry = LIST_NODE_ELEMENTS.get(v.load_addr)
+    if entry is not None:
+        return entry[1]
+
+    node_type = type_get_field_at(t, 0).type.GetPointeeType()
+    return List_Link(node_type, 0, type_field_offset(node_type, "next"))
+
+def type_field_offset(t: lldb.SBType, name: str) -> int:
+    for i in range(t.GetNumberOfFields()):
+        field = type_get_field_at(t, i)
+        if field.name == name:
+            return field.GetOffsetInBytes()
+    raise KeyError(f"{t.name} has no field '{name}'")
+
+def list_first(v: lldb.SBValue) -> int:
+    """Address of the first node, 0 for an empty list."""
+    v = v.GetNonSyntheticValue()
+    if v.type.is_pointer:
+        return v.GetValueAsUnsigned(0)
+    return value_get_child(v, "head").GetValueAsUnsigned(0)
+
+def list_next(process: lldb.SBProcess, node: int, next_offset: int) -> int:
+    """Address of the node after `node`, 0 at the end (or if it can't be read)."""
+    size = process.GetAddressByteSize()
+    data = read_memory(process, node + next_offset, size)
+    if data is None:
+        return 0
+    return int.from_bytes(data, "little" if process.GetByteOrder() == lldb.eByteOrderLittle else "big")
+
+class List_Walk:
+    def __init__(self) -> None:
+        self.length      = 0
+        self.cycle_start: int | None  = None # index the last node points back to
+        self.checkpoints: list[int]   = []   # address of the nodes at multiples of LIST_CHECKPOINT_NODES
+
+def list_walk(process: lldb.SBProcess, first: int, next_offset: int) -> List_Walk:
+    walk = List_Walk()
+    if first == 0:
+        return walk
+
+    def next_node(node: int) -> int:
+        return list_next(process, node, next_offset)
+
+    # Floyd: the hare visits every node in order, two for each node of the tortoise,
+    # they can only meet in a cycle
+    hare, hare_index, tortoise = first, 0, first
+    walk.checkpoints.append(first)
+
+    while walk.length == 0:
+        for _ in range(2):
+            following = next_node(hare)
+            if following == 0 or hare_index + 1 >= LIST_MAX_NODES:
+                walk.length = hare_index + 1
+                break
+
+            hare        = following
+            hare_index += 1
+            if hare_index % LIST_CHECKPOINT_NODES == 0:
+                walk.checkpoints.append(hare)
+
+        if walk.length > 0:
+            break
+
+        tortoise = next_node(tortoise)
+        if tortoise != hare:
+            continue
+
+        # the cycle starts after as many nodes from the first node as from where they met
+        node, meeting, start = first, hare, 0
+        while node != meeting:
+            node    = next_node(node)
+            meeting = next_node(meeting)
+            start  += 1
+
+        period, node = 1, next_node(meeting)
+        while node != meeting:
+            node    = next_node(node)
+            period += 1
+
+        walk.length      = start + period
+        walk.cycle_start = start
+
+    # the hare went around the cycle
+    del walk.checkpoints[math.ceil(walk.length / LIST_CHECKPOINT_NODES):]
+    return walk
+
+@cached_summary
+def list_summary(v: lldb.SBValue, _dict) -> str:
+    v     = v.GetNonSyntheticValue()
+    link  = list_link(v)
+    first = list_first(v)
+
+    if first == 0:
+        return "nil" if v.type.is_pointer else "list[0]{}"
+
+    # lists reached from their own elements end like pointers
+    path = SUMMARY_PATH
+    node = (first - link.node_offset, link.element_type.name)
+    if node in path.nodes:
+        path.cuts += 1
+        return f"list<cycle {node[0]:#x}>"
+
+    if path.depth >= POINTER_SUMMARY_MAX_DEPTH:
+        path.cuts += 1
+        return "list{...}"
+
+    nodes: list[int] = []
+    seen:  set[int]  = set()
+    cycle_start = None
+
+    address = first
+    while address != 0 and len(nodes) < LIST_SUMMARY_MAX_NODES:
+        if address in seen:
+            cycle_start = nodes.index(address)
+            break
+        seen.add(address)
+        nodes.append(address)
+        address = list_next(v.process, address, link.next_offset)
+
+    complete = address == 0 or cycle_start is not None
+    length   = f"{len(nodes)}" if complete else f"{len(nodes)}+"
+    suffix   = "}" if cycle_start is None else f"}} <cycle to [{cycle_start}]>"
+
+    # nodes without an element type only have the links
+    if link.element_type.name == LIST_NODE_TYPE_NAME:
+        return f"list[{length}]" + suffix[1:]
+
+    def get_value(i: int, budget: int | None) -> str:
+        element = v.CreateValueFromAddress(f"[{i}]", nodes[i] - link.node_offset, link.element_type)
+        fields  = [j for j in range(element.num_children) if j != link.link_field]
+        return aggregate_value_summary("{", "}",
+            get_value=lambda j, budget: value_summary(element.GetChildAtIndex(fields[j]), budget),
+            length=len(fields),
+        )
+
+    # every listed element is being summarized, pointers back to them are cycles
+    elements = [(address - link.node_offset, link.element_type.name) for address in nodes]
+    path.nodes.extend(elements)
+    path.depth += 1
+    try:
+        return aggregate_value_summary(f"list[{length}]{{", suffix, get_value=get_value, length=len(nodes))
+    finally:
+        del path.nodes[-len(elements):]
+        path.depth -= 1
+
+class List_Children_Provider(lldb.SBSyntheticValueProvider):
+    """The elements as `[i]` children, followed by `len`."""
+
+    def __init__(self, val: lldb.SBValue, _dict) -> None:
+        self.val = val
+
+    def update(self) -> None:
+        self.link  = list_link(self.val)
+        first      = list_first(self.val)
+
+        process   = self.val.process
+        self.walk = STOP_CACHE.get(process, ("list_walk", first, self.link.next_offset),
+                                   lambda: list_walk(process, first, self.link.next_offset))
+
+        # (index, address) of the last child, the next one is a single step away
+        self.cursor = (0, first)
+
+    def has_children(self) -> bool:
+        return True
+
+    def num_children(self) -> int:
+        return self.walk.length + 1
+
+    def get_child_index(self, name: str) -> int | None:
+        if name == "len":
+            return self.walk.length
+
+        match = ELEMENT_NAME_RE.match(name)
+        if match and int(match[1]) < self.walk.length:
+            return int(match[1])
+
+        return None
+
+    def get_child_at_index(self, idx: int) -> lldb.SBValue:
+        if idx == self.walk.length:
+            int_type = self.val.target.FindFirstType("int")
+            len_data = lldb.SBData.CreateDataFromInt(self.walk.length, int_type.GetByteSize())
+            return self.val.CreateValueFromData("len", len_data, int_type)
+
+        address = self.node_at(idx) - self.link.node_offset
+        return self.val.CreateValueFromAddress(f"[{idx}]", address, self.link.element_type)
+
+    def node_at(self, idx: int) -> int:
+        index, node = self.cursor
+
+        checkpoint = idx - idx % LIST_CHECKPOINT_NODES
+        if index > idx or index < checkpoint:
+            index, node = checkpoint, self.walk.checkpoints[idx // LIST_CHECKPOINT_NODES]
+
+        while index < idx:
+            node   = list_next(self.val.process, node, self.link.next_offset)
+            index += 1
+
+        self.cursor = (idx, node)
+        return node
+
+def list_command(
+    debugger: lldb.SBDebugger,
+    command:  str,
+    result:   lldb.SBCommandReturnObject,
+    _dict:    dict,
+) -> None:
+    """odin-list [<Type> <field> [<list>] | clear] -- shows lists of Type linked through field as flat arrays"""
+    args  = command.split()
+    usage = "Usage: odin-list [<Type> <field> [<list>] | clear]"
+
+    if not args:
+        for address, (expr, link) in LIST_NODE_ELEMENTS.items():
+            result.AppendMessage(f"{expr} ({address:#x}): {type_display(link.element_type)}")
+        for name in LINKED_TYPES:
+            result.AppendMessage(f"linked: {name.replace('::', '.')}")
+        return
+
+    if args == ["clear"]:
+        for name in LINKED_TYPES:
+            debugger.HandleCommand(f"type synth delete '{name} *'")
+        LINKED_TYPES.clear()
+        LIST_NODE_ELEMENTS.clear()
+    elif len(args) in (2, 3):
+        type_name, field_name, *list_name = args
+        element_type = debugger.GetSelectedTarget().FindFirstType(type_name.replace(".", "::"))
+        if not element_type.IsValid():
+            result.SetError(f"Type '{type_name}' not found")
+            return
+
+        fields = [type_get_field_at(element_type, i) for i in range(element_type.GetNumberOfFields())]
+        index  = next((i for i, f in enumerate(fields) if f.name == field_name), None)
+        if index is None:
+            result.SetError(f"{type_name} has no field '{field_name}'")
+            return
+
+        field = fields[index]
+        if field.type.is_pointer and field.type.GetPointeeType().name == element_type.name:
+            if list_name:
+                result.SetError(usage)
+                return
+            LINKED_TYPES[element_type.name] = List_Link(element_type, 0, field.GetOffsetInBytes(), index)
+            # pointer types are not matched by name otherwise, LLDB would keep asking the recognizer
+            debugger.HandleCommand(f"type synth add --python-class odin.Children_Provider '{element_type.name} *'")
+            result.AppendMessage(f"^{type_display(element_type)} is shown as a list through {field_name}")
+        elif field.type.name == LIST_NODE_TYPE_NAME:
+            if not list_name:
+                result.SetError(f"Lists of {type_name} need the list: odin-list {type_name} {field_name} <list>")
+                return
+            frame = debugger.GetSelectedTarget().GetProcess().GetSelectedThread().GetSelectedFrame()
+
+            list_val = frame.GetValueForVariablePath(list_name[0])
+            if not list_val.IsValid():
+                list_val = frame.EvaluateExpression(list_name[0])
+            if not list_val.IsValid() or list_val.GetError().Fail():
+                result.SetError(f"Cannot evaluate '{list_name[0]}'")
+                return
+
+            list_val = list_val.GetNonSyntheticValue()
+            if list_val.type.name != LIST_TYPE_NAME:
+                result.SetError(f"'{list_name[0]}' is not a list.List")
+                return
+            if list_val.load_addr == lldb.LLDB_INVALID_ADDRESS:
+                result.SetError(f"'{list_name[0]}' is not in memory")
+                return
+
+            next_offset = type_field_offset(field.type, "next")
+            link        = List_Link(element_type, field.GetOffsetInBytes(), next_offset, index)
+            LIST_NODE_ELEMENTS[list_val.load_addr] = (list_name[0], link)
+            result.AppendMessage(f"{list_name[0]} elements are shown as {type_display(element_type)}")
+        else:
+            result.SetError(f"'{field_name}' is neither a list.Node nor a ^{type_name}")
+            return
+    else:
+        result.SetError(usage)
+        return
+
+    # pointers change their Odin type, summaries of the old one are stale
+    ODIN_TYPE_CACHE.clear()
+    STOP_CACHE.clear()
+
+
 # ------------------------------------------------------------------------------
 # Union Values
 
@@ -431,39 +2264,83 @@ class Cell_Info:
 #        v1:  T1
 #        ...
 
-def is_type_union  (t: lldb.SBType, _dict) -> bool:
-    if t.type == lldb.eTypeClassUnion:
-        tag = type_get_field_at(t, 0)
-        if tag.IsValid() and tag.name == "tag":
-            return True
-    return False
+#
+# The tag and variant fields are looked up once per union type,
+# a variant is then one read of the tag and one child at a known offset.
 
 def union_is_no_nil(t: lldb.SBType) -> bool:
     first = type_get_field_at(t, 1)
     return first.IsValid() and first.name == "v0"
 
+class Union_Layout:
+    def __init__(self, t: lldb.SBType) -> None:
+        tag = type_get_field_at(t, 0)
+        assert tag.name == "tag"
+
+        self.tag_offset = tag.GetOffsetInBytes()
+        self.tag_size   = tag.type.size
+        self.no_nil     = union_is_no_nil(t)
+
+        # tag -> (field name, offset, type)
+        self.variants: dict[int, tuple[str, int, lldb.SBType]] = {}
+        # field name -> type shown in the summary
+        self.displays: dict[str, str] = {}
+        for i in range(1, t.GetNumberOfFields()):
+            field = type_get_field_at(t, i)
+            if field.name.startswith("v") and field.name[1:].isdigit():
+                self.variants[int(field.name[1:])] = (field.name, field.GetOffsetInBytes(), field.type)
+                self.displays[field.name] = type_display(field.type)
+
+UNION_LAYOUTS: dict[str, Union_Layout] = {}
+
+def union_layout(t: lldb.SBType) -> Union_Layout:
+    layout = UNION_LAYOUTS.get(t.name)
+    if layout is None:
+        layout = Union_Layout(t)
+        if t.name:
+            UNION_LAYOUTS[t.name] = layout
+    return layout
+
+def union_tag(v: lldb.SBValue, layout: Union_Layout) -> int:
+    addr = v.load_addr
+    if addr != lldb.LLDB_INVALID_ADDRESS:
+        process = v.process
+        data    = read_memory(process, addr + layout.tag_offset, layout.tag_size)
+        if data is not None:
+            return int.from_bytes(data, "little" if process.GetByteOrder() == lldb.eByteOrderLittle else "big")
+
+    return v.GetChildAtIndex(0).unsigned
+
 def union_variant(v: lldb.SBValue) -> lldb.SBValue | None:
     if v.IsSynthetic():
         v = v.GetNonSyntheticValue()
 
-    tag = v.GetChildAtIndex(0)
-    assert(tag.name == "tag")
+    layout    = union_layout(v.type)
+    tag_value = union_tag(v, layout)
 
-    tag_value = tag.unsigned
-    
-    is_no_nil = union_is_no_nil(v.type)
+    if not layout.no_nil and tag_value == 0:
+        return None
 
-    if not is_no_nil and tag_value == 0:
+    variant = layout.variants.get(tag_value)
+    if variant is None:
         return None
-    
-    return v.GetChildMemberWithName(f"v{tag_value}")
 
+    name, offset, t = variant
+    return v.CreateChildAtOffset(name, offset, t)
+
+@cached_summary
 def union_summary(v: lldb.SBValue, _dict) -> str:
     variant = union_variant(v)
     if variant is None:
         return "nil"
 
-    return f"{type_display(variant.type)}({value_summary(variant)})"
+    variant_type = union_layout(v.GetNonSyntheticValue().type).displays[variant.name]
+
+    budget = summary_budget
+    if budget is not None:
+        budget -= len(variant_type) + 2
+
+    return f"{variant_type}({value_summary(variant, budget)})"
 
 class Union_Children_Provider(lldb.SBSyntheticValueProvider):
     def __init__(self, val: lldb.SBValue, _dict) -> None:
@@ -486,6 +2363,275 @@ class Union_Children_Provider(lldb.SBSyntheticValueProvider):
 
 
 
+# ------------------------------------------------------------------------------
+# Any and Typeid Values
+#
+#    Raw_Any :: struct {
+#        data: rawptr,
+#        id:   typeid,
+#    }
+#
+# A typeid is resolved through runtime.type_table, which holds the Type_Info of every type:
+# `[]Type_Info` indexed by the typeid in older compilers, `[]^Type_Info` hashed by it in newer ones.
+# The table is indexed by Type_Info.id in one pass, the Type_Info of a typeid is then decoded into an SBType.
+# Types don't change while the program runs, so the index is kept until modules are loaded.
+
+TYPE_TABLE_NAMES = ("runtime::type_table", "runtime.type_table", "type_table")
+
+# Bytes of the table (or of the Type_Info structs) read at once
+TYPE_TABLE_READ_CHUNK = 1 << 20
+
+INTEGER_TYPE_NAMES  = {1: "i8", 2: "i16", 4: "i32", 8: "int", 16: "i128"}
+UNSIGNED_TYPE_NAMES = {1: "u8", 2: "u16", 4: "u32", 8: "uint", 16: "u128"}
+FLOAT_TYPE_NAMES    = {2: "f16", 4: "f32", 8: "f64"}
+BOOLEAN_TYPE_NAMES  = {1: "bool", 2: "b16", 4: "b32", 8: "b64"}
+
+class Type_Table:
+    def __init__(self, modules: int) -> None:
+        self.modules = modules
+        # typeid -> type, the same for every run of the target
+        self.types: dict[int, lldb.SBType | None] = {}
+        # typeid -> Type_Info address, for the current process
+        self.process_id: int | None = None
+        self.addresses:  dict[int, int] = {}
+        self.decoded:    dict[int, lldb.SBType | None] = {}
+        self.info_type:  lldb.SBType | None = None
+
+    def type_of(self, v: lldb.SBValue, typeid: int) -> lldb.SBType | None:
+        if typeid in self.types:
+            return self.types[typeid]
+
+        if v.process.GetUniqueID() != self.process_id:
+            self.read_index(v)
+
+        addr = self.addresses.get(typeid)
+        t    = self.decode(v, addr) if addr is not None else None
+
+        # nothing is known without the table
+        if self.addresses:
+            self.types[typeid] = t
+        return t
+
+    def read_index(self, v: lldb.SBValue) -> None:
+        process = v.process
+
+        self.process_id = process.GetUniqueID()
+        self.addresses  = {}
+        self.decoded    = {}
+
+        table = find_type_table(v.target)
+        if table is None:
+            return
+
+        length   = get_len(table)
+        data     = get_data(table)
+        elem     = data.type.GetPointeeType()
+        base     = data.GetValueAsUnsigned(0)
+        order    = "little" if process.GetByteOrder() == lldb.eByteOrderLittle else "big"
+        ptr_size = process.GetAddressByteSize()
+
+        if elem.is_pointer:
+            self.info_type = elem.GetPointeeType()
+            pointers = []
+            per_read = TYPE_TABLE_READ_CHUNK // ptr_size
+            for first in range(0, length, per_read):
+                raw = read_memory(process, base + first * ptr_size, min(per_read, length - first) * ptr_size)
+                if raw is None:
+                    return
+                pointers += [int.from_bytes(raw[i:i+ptr_size], order) for i in range(0, len(raw), ptr_size)]
+            pointers = [pointer for pointer in pointers if pointer != 0]
+        else:
+            self.info_type = elem
+            pointers = [base + i * elem.size for i in range(length)]
+
+        id_field = None
+        for i in range(self.info_type.GetNumberOfFields()):
+            field = type_get_field_at(self.info_type, i)
+            if field.name == "id":
+                id_field = field
+        if id_field is None or not pointers:
+            return
+
+        offset = id_field.byte_offset
+        size   = id_field.type.size
+
+        # the Type_Info structs are emitted next to each other, so the ids are read
+        # a chunk of neighbours at a time, gaps between the chunks are skipped
+        end         = max(pointers) + offset + size
+        chunk       = b""
+        chunk_start = 0
+        ids: dict[int, bytes | None] = {}
+        for pointer in sorted(pointers):
+            at = pointer + offset - chunk_start
+            if at + size > len(chunk):
+                chunk_start = pointer + offset
+                chunk       = read_memory(process, chunk_start, min(TYPE_TABLE_READ_CHUNK, end - chunk_start)) or b""
+                at          = 0
+            if at + size <= len(chunk):
+                ids[pointer] = chunk[at:at + size]
+            else:
+                ids[pointer] = read_memory(process, pointer + offset, size)
+
+        # in table order, the first Type_Info of an id wins
+        for pointer in pointers:
+            raw_id = ids[pointer]
+            if raw_id:
+                self.addresses.setdefault(int.from_bytes(raw_id, order), pointer)
+
+    def decode(self, v: lldb.SBValue, addr: int) -> lldb.SBType | None:
+        if addr not in self.decoded:
+            self.decoded[addr] = None # for types referring to themselves
+            info = v.CreateValueFromAddress("type_info", addr, self.info_type)
+            self.decoded[addr] = type_info_type(self, v, info)
+        return self.decoded[addr]
+
+# executable path -> table
+TYPE_TABLES: dict[str, Type_Table] = {}
+
+def get_type_table(target: lldb.SBTarget) -> Type_Table:
+    key     = target.GetExecutable().fullpath
+    modules = target.GetNumModules()
+
+    table = TYPE_TABLES.get(key)
+    if table is None or table.modules != modules:
+        table = TYPE_TABLES[key] = Type_Table(modules)
+    return table
+
+def find_type_table(target: lldb.SBTarget) -> lldb.SBValue | None:
+    for name in TYPE_TABLE_NAMES:
+        table = target.FindFirstGlobalVariable(name)
+        if table.IsValid():
+            return table.GetNonSyntheticValue()
+    return None
+
+def type_info_type(table: Type_Table, v: lldb.SBValue, info: lldb.SBValue) -> lldb.SBType | None:
+    """The SBType described by a runtime.Type_Info."""
+    target  = v.target
+    size    = value_get_child(info, "size").signed
+    variant = union_variant(value_get_child(info, "variant"))
+    if variant is None:
+        return None
+
+    kind = variant.type.name.rsplit("::", 1)[-1]
+
+    def referenced(field: str) -> lldb.SBType | None:
+        pointer = value_get_child(variant, field).GetValueAsUnsigned(0)
+        return table.decode(v, pointer) if pointer != 0 else None
+
+    name = None
+
+    if kind == "Type_Info_Named":
+        type_name = read_odin_string(value_get_child(variant, "name"))
+        pkg       = read_odin_string(value_get_child(variant, "pkg"))
+        for candidate in (f"{pkg}::{type_name}", type_name):
+            t = target.FindFirstType(candidate)
+            if t.IsValid():
+                return t
+        return None
+
+    elif kind == "Type_Info_Integer":
+        names = INTEGER_TYPE_NAMES if value_get_child(variant, "signed").unsigned else UNSIGNED_TYPE_NAMES
+        name  = names.get(size)
+    elif kind == "Type_Info_Float":   name = FLOAT_TYPE_NAMES.get(size)
+    elif kind == "Type_Info_Boolean": name = BOOLEAN_TYPE_NAMES.get(size)
+    elif kind == "Type_Info_Rune":    name = "rune"
+    elif kind == "Type_Info_Any":     name = "any"
+    elif kind == "Type_Info_Type_Id": name = "typeid"
+    elif kind == "Type_Info_String":
+        name = "cstring" if value_get_child(variant, "is_cstring").unsigned else "string"
+
+    elif kind in ("Type_Info_Pointer", "Type_Info_Multi_Pointer"):
+        if value_get_child(variant, "elem").GetValueAsUnsigned(0) == 0:
+            return target.GetBasicType(lldb.eBasicTypeVoid).GetPointerType()
+        elem = referenced("elem")
+        return elem.GetPointerType() if elem else None
+
+    elif kind == "Type_Info_Array":
+        elem = referenced("elem")
+        return elem.GetArrayType(value_get_child(variant, "count").signed) if elem else None
+
+    elif kind in ("Type_Info_Slice", "Type_Info_Dynamic_Array"):
+        elem = referenced("elem")
+        if elem:
+            name = ("[]" if kind == "Type_Info_Slice" else "[dynamic]") + elem.name
+
+    elif kind == "Type_Info_Map":
+        key, value = referenced("key"), referenced("value")
+        if key and value:
+            name = f"map[{key.name}]{value.name}"
+
+    if name is None:
+        return None
+
+    t = target.FindFirstType(name)
+    return t if t.IsValid() else None
+
+def read_odin_string(v: lldb.SBValue) -> str:
+    string = read_string(v.process, get_data(v).GetValueAsUnsigned(0), get_len(v))
+    return string[0] if string else ""
+
+def any_value(v: lldb.SBValue) -> lldb.SBValue | None:
+    """The value an any points to, None if it is nil or of an unknown type."""
+    if v.IsSynthetic():
+        v = v.GetNonSyntheticValue()
+
+    pointer = value_get_child(v, "data").GetValueAsUnsigned(0)
+    if pointer == 0:
+        return None
+
+    t = get_type_table(v.target).type_of(v, value_get_child(v, "id").GetValueAsUnsigned(0))
+    if t is None:
+        return None
+
+    return v.CreateValueFromAddress("data", pointer, t)
+
+@cached_summary
+def any_summary(v: lldb.SBValue, _dict) -> str:
+    if value_get_child(v.GetNonSyntheticValue(), "data").GetValueAsUnsigned(0) == 0:
+        return "nil"
+
+    value = any_value(v)
+    if value is None:
+        return struct_summary(v, _dict)
+
+    value_type = type_display(value.type)
+
+    budget = summary_budget
+    if budget is not None:
+        budget -= len(value_type) + 2
+
+    return f"{value_type}({value_summary(value, budget)})"
+
+def typeid_summary(v: lldb.SBValue, _dict) -> str:
+    typeid = v.GetValueAsUnsigned(0)
+    if typeid == 0:
+        return "nil"
+
+    t = get_type_table(v.target).type_of(v, typeid)
+    return type_display(t) if t else f"typeid({typeid:#x})"
+
+class Any_Children_Provider(lldb.SBSyntheticValueProvider):
+    """Children of the value, or the data and id fields if its type is unknown."""
+
+    def __init__(self, val: lldb.SBValue, _dict) -> None:
+        self.val = val
+
+    def update(self) -> None:
+        self.value = any_value(self.val) or self.val.GetNonSyntheticValue()
+
+    def has_children(self) -> bool:
+        return self.value.MightHaveChildren()
+
+    def num_children(self) -> int:
+        return self.value.num_children
+
+    def get_child_at_index(self, idx) -> lldb.SBValue:
+        return self.value.GetChildAtIndex(idx)
+
+    def get_child_index(self, name) -> int | None:
+        return self.value.GetIndexOfChildWithName(name)
+
+
 def correct_proc_type_display(t: lldb.SBType) -> str:
 
     type_name = t.name
@@ -564,6 +2710,10 @@ def correct_proc_type_display(t: lldb.SBType) -> str:
     
     return result.replace('  ', ' ').strip()  # Clean up extra spaces
 
+POINTER_SUMMARY_AGGREGATE_CLASSES = lldb.eTypeClassStruct | lldb.eTypeClassUnion | \
+                                    lldb.eTypeClassClass  | lldb.eTypeClassArray
+
+@cached_summary
 def pointer_summary(ptr: lldb.SBValue, _dict) -> str:
 
     # nil pointer
@@ -602,8 +2752,34 @@ def pointer_summary(ptr: lldb.SBValue, _dict) -> str:
     pointee: lldb.SBValue = ptr.Dereference()
     if not pointee.IsValid():
         return type_display(ptr.type)
-    
-    pointee_summary = pointee.GetSummary()
+
+    path = SUMMARY_PATH
+    node = (ptr.GetValueAsUnsigned(), pointee_type.name)
+
+    if node in path.nodes:
+        path.cuts += 1
+        return f"&<cycle {node[0]:#x}>"
+
+    # scalars end the chain, only aggregates can point further
+    if path.depth >= POINTER_SUMMARY_MAX_DEPTH and \
+       pointee_type.GetCanonicalType().type & POINTER_SUMMARY_AGGREGATE_CLASSES:
+        path.cuts += 1
+        return "&{...}"
+
+    path.nodes.append(node)
+    path.depth += 1
+    try:
+        if get_odin_type(pointee.type) in SUMMARIES:
+            budget = summary_budget
+            if budget is not None:
+                budget -= 1
+            pointee_summary = value_summary(pointee, budget)
+        else:
+            pointee_summary = pointee.GetSummary()
+    finally:
+        path.nodes.pop()
+        path.depth -= 1
+
     if pointee_summary:
         return f"&{pointee_summary}"
     else:
@@ -613,3 +2789,731 @@ def pointer_summary(ptr: lldb.SBValue, _dict) -> str:
             return f"({pointee_type_str}){pointee_value}"
         else:
             return f"{pointee_type_str}"
+
+
+# ------------------------------------------------------------------------------
+# Dispatch
+#
+# A single summary function and a single synthetic provider are registered,
+# they look up the formatter for the value's Odin type.
+
+SUMMARIES: dict[Odin_Type, Callable[[lldb.SBValue, dict], str]] = {
+    Odin_Type.STRUCT:   struct_summary,
+    Odin_Type.UNION:    union_summary,
+    Odin_Type.STRING:   string_summary,
+    Odin_Type.CSTRING:  cstring_summary,
+    Odin_Type.SLICE:    slice_summary,
+    Odin_Type.ARRAY:    array_summary,
+    Odin_Type.MAP:      map_summary,
+    Odin_Type.PTR:      pointer_summary,
+    Odin_Type.ENUM:     enum_summary,
+    Odin_Type.BIT_SET:  bit_set_summary,
+    Odin_Type.SOA:      soa_summary,
+    Odin_Type.ANY:      any_summary,
+    Odin_Type.TYPEID:   typeid_summary,
+    Odin_Type.LIST:     list_summary,
+}
+
+# Types whose value is replaced by the summary (--no-value)
+SUMMARIES_NO_VALUE = {Odin_Type.PTR, Odin_Type.CSTRING, Odin_Type.ENUM, Odin_Type.TYPEID}
+
+PROVIDERS: dict[Odin_Type, type] = {
+    Odin_Type.UNION:   Union_Children_Provider,
+    Odin_Type.SLICE:   Slice_Children_Provider,
+    Odin_Type.MAP:     Map_Children_Provider,
+    Odin_Type.BIT_SET: Bit_Set_Children_Provider,
+    Odin_Type.SOA:     Soa_Children_Provider,
+    Odin_Type.ANY:     Any_Children_Provider,
+    Odin_Type.LIST:    List_Children_Provider,
+}
+
+# Type names matched by LLDB without calling into Python: (name, is regex, --no-value).
+# A name only picks the summary function, it still dispatches on get_odin_type.
+# The patterns are disjoint, LLDB doesn't promise which of two matching regexes wins:
+# names ending in `*` are pointers, names ending in `]` arrays, the others are told apart by their start.
+# Named types can't be told apart by name, named scalars (enums, distinct types) need --no-value,
+# so named structs get it as well. Types without a formatter show their value.
+# Anonymous structs, unions and enums, and the children of named unions and bit_sets,
+# are left to the recognizers.
+SUMMARY_TYPE_NAMES = [
+    ("string",                            False, False),
+    ("any",                               False, False),
+    ("cstring",                           False, True),
+    ("typeid",                            False, True),
+    (r"\*$",                              True,  True),  # pointers
+    (r"\]$",                              True,  False), # arrays and anonymous bit_sets
+    (r"^\[(dynamic)?\].*[^]*]$",          True,  False), # slices and dynamic arrays
+    (r"^map\[.*[^]*]$",                   True,  False),
+    (r"^#soa\[.*[^]*]$",                  True,  False),
+    (r"^proc[ (].*[^]*]$",                 True,  True),
+    (r"^[A-Za-z_][A-Za-z0-9_]*::.*[^]*]$", True,  True),  # named types: structs, unions, enums, bit_sets, distinct types
+]
+
+SYNTH_TYPE_NAMES = [
+    ("any",                      False),
+    (LIST_TYPE_NAME,             False),
+    (r"^\[(dynamic)?\].*[^]*]$", True), # same rule as classify_odin_type
+    (r"^map\[.*[^]*]$",          True),
+    (r"^#soa\[.*[^]*]$",         True),
+    (r"^bit_set\[[^]]*]$",       True),
+]
+
+def is_type_summarized(t: lldb.SBType, _dict) -> bool:
+    odin_type = get_odin_type(t)
+    return odin_type in SUMMARIES and odin_type not in SUMMARIES_NO_VALUE
+
+def is_type_summarized_no_value(t: lldb.SBType, _dict) -> bool:
+    return get_odin_type(t) in SUMMARIES_NO_VALUE
+
+def is_type_synthesized(t: lldb.SBType, _dict) -> bool:
+    return get_odin_type(t) in PROVIDERS
+
+def summary(v: lldb.SBValue, _dict) -> str | None:
+    global summary_budget
+
+    fn = SUMMARIES.get(get_odin_type(v.type))
+    if fn is None:
+        return None
+
+    # the value itself is on the path, pointers back to it are cycles
+    path = SUMMARY_PATH
+    addr = v.load_addr
+    node = (addr, v.type.name) if addr != lldb.LLDB_INVALID_ADDRESS else None
+    if node is not None:
+        path.nodes.append(node)
+
+    # LLDB keeps the result as the value's summary, it is never cut
+    outer_budget   = summary_budget
+    summary_budget = None
+    try:
+        return fn(v, _dict)
+    finally:
+        summary_budget = outer_budget
+        if node is not None:
+            path.nodes.pop()
+
+def summary_no_value(v: lldb.SBValue, _dict) -> str | None:
+    """Summary for types registered with --no-value by name, types without a formatter show their value."""
+    result = summary(v, _dict)
+    if result is None:
+        return v.GetValue()
+    return result
+
+class Children_Provider:
+    """Creates the synthetic children provider for the value's Odin type."""
+
+    def __new__(cls, val: lldb.SBValue, _dict):
+        provider = PROVIDERS.get(get_odin_type(val.type), Value_Children_Provider)
+        return provider(val, _dict)
+
+class Value_Children_Provider(lldb.SBSyntheticValueProvider):
+    """The value's own children, for types matched by name that have no provider."""
+
+    def __init__(self, val: lldb.SBValue, _dict) -> None:
+        self.val = val.GetNonSyntheticValue()
+
+    def update(self) -> None:
+        pass
+
+    def has_children(self) -> bool:
+        return self.val.MightHaveChildren()
+
+    def num_children(self) -> int:
+        return self.val.num_children
+
+    def get_child_at_index(self, idx) -> lldb.SBValue:
+        return self.val.GetChildAtIndex(idx)
+
+    def get_child_index(self, name) -> int | None:
+        return self.val.GetIndexOfChildWithName(name)
+
+
+# ------------------------------------------------------------------------------
+# Profiling
+#
+# `odin-profile start` swaps the formatters in SUMMARIES and the provider methods
+# for timing wrappers, `odin-profile stop` puts the originals back,
+# so nothing is measured (or slowed down) while profiling is off.
+# Time and bytes read are attributed to the type of the value being formatted,
+# self time excludes the time of nested formatters.
+
+PROFILED_PROVIDER_METHODS = ("update", "num_children", "get_child_at_index", "get_child_index")
+
+class Profile_Entry:
+    def __init__(self) -> None:
+        self.calls      = 0
+        self.total_ns   = 0
+        self.self_ns    = 0
+        self.bytes_read = 0
+
+class Profiler:
+    def __init__(self) -> None:
+        self.entries: dict[tuple[str, str], Profile_Entry] = {}
+        # [entry, time spent in nested formatters] of the formatters being run
+        self.stack: list[list] = []
+        self.bytes_read = 0
+        self.originals: list[tuple[object, str, object]] = []
+
+    @property
+    def active(self) -> bool:
+        return len(self.originals) > 0
+
+    def reset(self) -> None:
+        self.entries.clear()
+        self.bytes_read = 0
+
+    def call(self, type_name: str, formatter: str, fn: Callable, *args):
+        key   = (type_name, formatter)
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self.entries[key] = Profile_Entry()
+
+        frame = [entry, 0]
+        self.stack.append(frame)
+        start = time.perf_counter_ns()
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            self.stack.pop()
+
+            entry.calls    += 1
+            entry.total_ns += elapsed
+            entry.self_ns  += elapsed - frame[1]
+            if self.stack:
+                self.stack[-1][1] += elapsed
+
+    def count_read(self, data: bytes | None) -> None:
+        if data and self.stack:
+            self.bytes_read += len(data)
+            self.stack[-1][0].bytes_read += len(data)
+
+    def patch(self, owner: object, name: str, wrapper: object) -> None:
+        if isinstance(owner, dict):
+            self.originals.append((owner, name, owner[name]))
+            owner[name] = wrapper
+        else:
+            self.originals.append((owner, name, getattr(owner, name)))
+            setattr(owner, name, wrapper)
+
+    def start(self) -> None:
+        if self.active:
+            return
+
+        for odin_type, fn in list(SUMMARIES.items()):
+            self.patch(SUMMARIES, odin_type, profiled_summary(self, fn))
+
+        for cls in set(PROVIDERS.values()):
+            for name in PROFILED_PROVIDER_METHODS:
+                if name in cls.__dict__:
+                    self.patch(cls, name, profiled_method(self, cls, cls.__dict__[name]))
+
+        self.patch(globals(), "read_memory", profiled_read_memory(self, read_memory))
+
+    def stop(self) -> None:
+        for owner, name, original in reversed(self.originals):
+            if isinstance(owner, dict):
+                owner[name] = original
+            else:
+                setattr(owner, name, original)
+        self.originals.clear()
+        self.stack.clear()
+
+    def report(self) -> list[dict]:
+        rows = [{
+            "type":       type_name,
+            "formatter":  formatter,
+            "calls":      entry.calls,
+            "total_ms":   entry.total_ns / 1e6,
+            "self_ms":    entry.self_ns / 1e6,
+            "bytes_read": entry.bytes_read,
+        } for (type_name, formatter), entry in self.entries.items()]
+
+        rows.sort(key=lambda row: row["self_ms"], reverse=True)
+        return rows
+
+def profiled_summary(profiler: Profiler, fn: Callable[[lldb.SBValue, dict], str]) -> Callable[[lldb.SBValue, dict], str]:
+    @functools.wraps(fn)
+    def wrapper(v: lldb.SBValue, _dict) -> str:
+        return profiler.call(v.type.name or "?", fn.__name__, fn, v, _dict)
+    return wrapper
+
+def profiled_method(profiler: Profiler, cls: type, fn: Callable) -> Callable:
+    formatter = f"{cls.__name__}.{fn.__name__}"
+
+    @functools.wraps(fn)
+    def wrapper(self, *args):
+        return profiler.call(self.val.type.name or "?", formatter, fn, self, *args)
+    return wrapper
+
+def profiled_read_memory(profiler: Profiler, fn: Callable[[lldb.SBProcess, int, int], bytes | None]) -> Callable[[lldb.SBProcess, int, int], bytes | None]:
+    @functools.wraps(fn)
+    def wrapper(process: lldb.SBProcess, addr: int, size: int) -> bytes | None:
+        data = fn(process, addr, size)
+        profiler.count_read(data)
+        return data
+    return wrapper
+
+PROFILER = Profiler()
+
+def profile_command(
+    debugger: lldb.SBDebugger,
+    command:  str,
+    result:   lldb.SBCommandReturnObject,
+    _dict:    dict,
+) -> None:
+    """odin-profile start|stop|reset|report [count]|json [file] -- times the formatters per type"""
+
+    args   = command.split()
+    action = args[0] if args else "report"
+    usage  = "Usage: odin-profile start|stop|reset|report [count]|json [file]"
+
+    if action == "start":
+        PROFILER.reset()
+        PROFILER.start()
+        result.AppendMessage("Profiling started")
+
+    elif action == "stop":
+        PROFILER.stop()
+        result.AppendMessage("Profiling stopped")
+
+    elif action == "reset":
+        PROFILER.reset()
+        result.AppendMessage("Profile reset")
+
+    elif action == "report":
+        if len(args) > 1 and not args[1].isdigit():
+            result.SetError(usage)
+            return
+
+        rows  = PROFILER.report()
+        count = int(args[1]) if len(args) > 1 else 30
+
+        result.AppendMessage(f"{'self ms':>10} {'total ms':>10} {'calls':>8} {'bytes read':>12}  formatter / type")
+        for row in rows[:count]:
+            result.AppendMessage(f"{row['self_ms']:>10.3f} {row['total_ms']:>10.3f} {row['calls']:>8} {row['bytes_read']:>12}  {row['formatter']} / {row['type']}")
+        if len(rows) > count:
+            result.AppendMessage(f"... {len(rows) - count} more")
+
+        state = "on" if PROFILER.active else "off"
+        result.AppendMessage(f"profiling: {state}, bytes read: {PROFILER.bytes_read}")
+
+    elif action == "json":
+        output = json.dumps(PROFILER.report(), indent=2)
+        if len(args) > 1:
+            with open(args[1], "w") as f:
+                f.write(output)
+            result.AppendMessage(f"Profile written to {args[1]}")
+        else:
+            result.AppendMessage(output)
+
+    else:
+        result.SetError(usage)
+
+
+# ------------------------------------------------------------------------------
+# Dump
+#
+# `odin-dump` writes a value and its children as one JSON object per line.
+# The tree is walked with a stack of child generators, one per level,
+# and every line is written as soon as it is made,
+# so memory stays bounded by the depth, not by the number of values written.
+
+DUMP_DEFAULT_DEPTH        = 8
+DUMP_DEFAULT_MAX_CHILDREN = 1000
+DUMP_MAX_MESSAGE_LINES    = 1000 # without --out, the lines are kept by LLDB until the command returns
+
+# the expression is everything before the first option
+DUMP_OPTIONS_RE = re.compile(r"(?:^|\s)--")
+
+# The summary is the whole content, the children are the raw header fields
+DUMP_LEAF_TYPES = {Odin_Type.STRING, Odin_Type.CSTRING, Odin_Type.TYPEID}
+
+def dump_children(v: lldb.SBValue, max_children: int) -> Iterator[lldb.SBValue]:
+    for i in range(v.GetNumChildren(max_children)):
+        yield v.GetChildAtIndex(i)
+
+def dump_path(parent: str, name: str) -> str:
+    return parent + name if name.startswith("[") else f"{parent}.{name}"
+
+def dump_record(v: lldb.SBValue, path: str, depth: int) -> dict:
+    leaf   = get_odin_type(v.type) in DUMP_LEAF_TYPES
+    record = {
+        "path":     path,
+        "depth":    depth,
+        "type":     type_display(v.type),
+        "value":    value_summary(v),
+        "children": 0 if leaf else v.GetNumChildren(),
+    }
+    if v.load_addr != lldb.LLDB_INVALID_ADDRESS:
+        record["address"] = f"0x{v.load_addr:x}"
+    return record
+
+def dump_values(root: lldb.SBValue, path: str, max_depth: int, max_children: int) -> Iterator[dict]:
+    """The records of the value and its children, depth first, up to max_children children per value."""
+    record = dump_record(root, path, 0)
+    yield record
+
+    stack: list[tuple[str, Iterator[lldb.SBValue]]] = []
+    if max_depth > 0 and record["children"] > 0:
+        stack.append((path, dump_children(root, max_children)))
+
+    while stack:
+        parent, children = stack[-1]
+        child = next(children, None)
+        if child is None:
+            stack.pop()
+            continue
+
+        record = dump_record(child, dump_path(parent, child.name or "?"), len(stack))
+        yield record
+
+        if len(stack) < max_depth and record["children"] > 0:
+            stack.append((record["path"], dump_children(child, max_children)))
+
+def dump_command(
+    debugger: lldb.SBDebugger,
+    command:  str,
+    result:   lldb.SBCommandReturnObject,
+    _dict:    dict,
+) -> None:
+    """odin-dump <expr> [--depth N] [--max-children M] [--out file] -- writes a value tree as NDJSON"""
+
+    usage = "Usage: odin-dump <expr> [--depth N] [--max-children M] [--out file]"
+
+    # the expression is kept as written (m["key"]), the options are split like a shell would
+    match = DUMP_OPTIONS_RE.search(command)
+    expr  = (command[:match.start()] if match else command).strip()
+
+    max_depth    = DUMP_DEFAULT_DEPTH
+    max_children = DUMP_DEFAULT_MAX_CHILDREN
+    out_path     = None
+    try:
+        args = shlex.split(command[match.start():]) if match else []
+        i = 0
+        while i < len(args):
+            if   args[i] == "--depth":        max_depth    = int(args[i+1]); i += 2
+            elif args[i] == "--max-children": max_children = int(args[i+1]); i += 2
+            elif args[i] == "--out":          out_path     = args[i+1];      i += 2
+            else:
+                raise ValueError(args[i])
+    except (IndexError, ValueError):
+        result.SetError(usage)
+        return
+
+    if not expr:
+        result.SetError(usage)
+        return
+
+    frame = debugger.GetSelectedTarget().GetProcess().GetSelectedThread().GetSelectedFrame()
+
+    value = frame.GetValueForVariablePath(expr)
+    if not value.IsValid():
+        value = frame.EvaluateExpression(expr)
+    if not value.IsValid() or value.GetError().Fail():
+        result.SetError(f"Cannot evaluate '{expr}'")
+        return
+
+    records = dump_values(value, expr, max_depth, max_children)
+
+    if out_path is None:
+        for count, record in enumerate(records):
+            if count == DUMP_MAX_MESSAGE_LINES:
+                result.AppendMessage(f"... more than {count} values, use --out <file> to write them all")
+                break
+            result.AppendMessage(json.dumps(record))
+        return
+
+    count = 0
+    with open(out_path, "w") as f:
+        for record in records:
+            f.write(json.dumps(record))
+            f.write("\n")
+            count += 1
+
+    result.AppendMessage(f"Wrote {count} values to {out_path}")
+
+
+# ------------------------------------------------------------------------------
+# Find
+#
+# `odin-find` scans a slice, dynamic array, fixed array or map for the elements
+# whose field compares to a value, without creating an SBValue per element.
+# The elements are read in large blocks and only the field is decoded, at its offset:
+#    == and != on integers, enums and bools compare the raw bytes of the field
+#       with the value encoded like a map key, found with bytes.find,
+#    other comparisons unpack the field of all elements of a block with one strided struct,
+#    strings compare their length first and read the text of the candidates only,
+#    cstrings read their text up to the NUL (one byte past the value for == and !=).
+
+FIND_READ_BLOCK_BYTES = 1 << 22
+# Matches shown, the rest are only counted
+FIND_MAX_RESULTS      = 100
+
+FIND_OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<":  operator.lt,
+    "<=": operator.le,
+    ">":  operator.gt,
+    ">=": operator.ge,
+}
+
+FIND_FIELD_PATH_RE = re.compile(r"\[(\d+)\]|([^.\[\]]+)")
+
+def find_field(t: lldb.SBType, path: str) -> tuple[int, lldb.SBType] | None:
+    """Offset and type of the field at the path (`pos.x`, `items[2].id`, `.` for the element itself)."""
+    offset = 0
+
+    for index, name in FIND_FIELD_PATH_RE.findall(path):
+        t = t.GetCanonicalType()
+
+        if index:
+            elem_type = t.GetArrayElementType()
+            if t.type != lldb.eTypeClassArray or elem_type.size == 0 or int(index) >= t.size // elem_type.size:
+                return None
+            offset += int(index) * elem_type.size
+            t       = elem_type
+            continue
+
+        for i in range(t.GetNumberOfFields()):
+            field = type_get_field_at(t, i)
+            if field.name == name and not field.IsBitfield():
+                offset += field.GetOffsetInBytes()
+                t       = field.type
+                break
+        else:
+            return None
+
+    return offset, t
+
+def find_struct_code(t: lldb.SBType) -> str | None:
+    """struct format of a scalar field, as compared by the ordering operators."""
+    if get_odin_type(t) == Odin_Type.ENUM:
+        int_type = t.GetEnumerationIntegerType()
+        signed   = int_type.IsValid() and int_type.GetTypeFlags() & lldb.eTypeIsSigned
+        base     = t
+    else:
+        base   = t.GetCanonicalType()
+        flags  = base.GetTypeFlags()
+        signed = flags & lldb.eTypeIsSigned
+        if flags & lldb.eTypeIsFloat:
+            return {4: "f", 8: "d"}.get(base.size)
+        if not (flags & lldb.eTypeIsInteger or base.is_pointer or base.type == lldb.eTypeClassBuiltin):
+            return None
+
+    code = {1: "b", 2: "h", 4: "i", 8: "q"}.get(base.size)
+    if code is None:
+        return None
+    return code if signed else code.upper()
+
+class Find_Predicate:
+    """Compares the field at `offset` of an element to the target, for a single element or a block of them."""
+
+    def __init__(self, process: lldb.SBProcess, offset: int, field_type: lldb.SBType, op: str, target: bytes) -> None:
+        self.process = process
+        self.offset  = offset
+        self.size    = field_type.size
+        self.op      = op
+        self.compare = FIND_OPERATORS[op]
+        self.endian  = "<" if process.GetByteOrder() == lldb.eByteOrderLittle else ">"
+        self.target  = target
+
+        odin_type      = get_odin_type(field_type)
+        self.is_string = odin_type in (Odin_Type.STRING, Odin_Type.CSTRING)
+        self.code      = None if self.is_string else find_struct_code(field_type)
+        # floats compare as numbers, 0.0 == -0.0
+        self.as_bytes  = not self.is_string and op in ("==", "!=") and self.code not in ("f", "d")
+
+        pointer_code = "Q" if process.GetAddressByteSize() == 8 else "I"
+        if odin_type == Odin_Type.STRING:
+            # Raw_String {data: [^]byte, len: int}
+            len_code    = "q" if self.size - process.GetAddressByteSize() == 8 else "i"
+            self.string = struct.Struct(self.endian + pointer_code + len_code)
+        elif odin_type == Odin_Type.CSTRING:
+            self.string = struct.Struct(self.endian + pointer_code)
+        elif not self.as_bytes:
+            if self.code is None:
+                raise ValueError(f"{type_display(field_type)} can only be compared with == and !=")
+            self.number = struct.unpack(self.endian + self.code, target)[0]
+
+    def string_matches(self, data: bytes, pos: int) -> bool:
+        fields = self.string.unpack_from(data, pos + self.offset)
+
+        if len(fields) == 1:
+            # a nil cstring has no text to compare
+            if fields[0] == 0:
+                return False
+            limit = len(self.target) + 1 if self.op in ("==", "!=") else MAP_CSTRING_KEY_MAX_BYTES
+            text  = read_cstring_bytes(self.process, fields[0], limit)
+            return text is not None and self.compare(text[:limit], self.target)
+
+        pointer, length = fields
+        if self.op in ("==", "!=") and length != len(self.target):
+            return self.op == "!="
+        text = read_memory(self.process, pointer, length) if length > 0 else b""
+        return text is not None and self.compare(text, self.target)
+
+    def test(self, data: bytes, pos: int) -> bool:
+        """Whether the element starting at pos of the buffer matches."""
+        if self.is_string:
+            return self.string_matches(data, pos)
+        if self.as_bytes:
+            start = pos + self.offset
+            return self.compare(data[start:start + self.size], self.target)
+        return self.compare(struct.unpack_from(self.endian + self.code, data, pos + self.offset)[0], self.number)
+
+    def scan(self, data: bytes, count: int, stride: int) -> Iterator[int]:
+        """Indices of the matching elements of a block of count elements, stride bytes apart."""
+        if self.as_bytes and self.op == "==":
+            pos = data.find(self.target, self.offset, count * stride)
+            while pos != -1:
+                i, misaligned = divmod(pos - self.offset, stride)
+                if misaligned == 0:
+                    yield i
+                    pos = data.find(self.target, pos + stride, count * stride)
+                else:
+                    pos = data.find(self.target, self.offset + (i + 1) * stride, count * stride)
+            return
+
+        if not self.is_string and not self.as_bytes:
+            padding = stride - self.offset - self.size
+            fields  = struct.Struct(f"{self.endian}{self.offset}x{self.code}{padding}x")
+            for i, (number,) in enumerate(fields.iter_unpack(data[:count * stride])):
+                if self.compare(number, self.number):
+                    yield i
+            return
+
+        for i in range(count):
+            if self.test(data, i * stride):
+                yield i
+
+def find_in_array(process: lldb.SBProcess, addr: int, length: int, stride: int, predicate: Find_Predicate) -> Iterator[int]:
+    """Indices of the matching elements of a contiguous array, read FIND_READ_BLOCK_BYTES at a time."""
+    block = max(1, FIND_READ_BLOCK_BYTES // stride)
+
+    for start in range(0, length, block):
+        count = min(block, length - start)
+        data  = read_memory(process, addr + start * stride, count * stride)
+        if data is None:
+            raise ValueError(f"Cannot read elements {start}..<{start + count} at 0x{addr + start * stride:x}")
+
+        for i in predicate.scan(data, count, stride):
+            yield start + i
+
+def find_in_map(entries: Map_Children_Provider, base: int, info: Cell_Info, predicate: Find_Predicate) -> Iterator[int]:
+    """Slots of the matching entries of a map, the hashes and cells of a block of slots are read at once."""
+    process = entries.val.process
+    block   = max(1, FIND_READ_BLOCK_BYTES // max(info.size_of_cell // info.elements_per_cell, MAP_HASH_SIZE))
+
+    for start in range(0, entries.cap, block):
+        count  = min(block, entries.cap - start)
+        hashes = entries.read_hashes(start, count)
+        first  = cell_index(base, info, start)
+        data   = read_memory(process, first, cell_index(base, info, start + count - 1) + info.size_of_type - first)
+        if hashes is None or data is None:
+            raise ValueError(f"Cannot read map slots {start}..<{start + count}")
+
+        for i, h in enumerate(hashes):
+            if 0 < h < MAP_TOMBSTONE_MASK and predicate.test(data, cell_index(base, info, start + i) - first):
+                yield start + i
+
+def find_command(
+    debugger: lldb.SBDebugger,
+    command:  str,
+    result:   lldb.SBCommandReturnObject,
+    _dict:    dict,
+) -> None:
+    """odin-find <container> <field path> <op> <value> [--first] -- finds the elements of a slice, array or map by a field"""
+
+    usage = "Usage: odin-find <container> <field path> <op> <value> [--first]  (map paths start with key or value)"
+
+    text  = command.strip()
+    first = text.endswith(" --first")
+    if first:
+        text = text[:-len(" --first")]
+
+    args = text.split(None, 3)
+    if len(args) < 4 or args[2] not in FIND_OPERATORS:
+        result.SetError(usage)
+        return
+
+    expr, path, op, value_text = args
+    frame = debugger.GetSelectedTarget().GetProcess().GetSelectedThread().GetSelectedFrame()
+
+    container = frame.GetValueForVariablePath(expr)
+    if not container.IsValid():
+        container = frame.EvaluateExpression(expr)
+    if not container.IsValid() or container.GetError().Fail():
+        result.SetError(f"Cannot evaluate '{expr}'")
+        return
+
+    process   = container.process
+    base      = container.GetNonSyntheticValue()
+    odin_type = get_odin_type(container.type)
+
+    # element type, and a function from match to the value shown
+    if odin_type == Odin_Type.MAP:
+        entries = Map_Children_Provider(base, _dict)
+        entries.read_layout()
+
+        side, _, path = path.partition(".")
+        if side == "key":
+            elem_type, cell_base, info = entries.key_type, entries.key_ptr, entries.key_cell_info
+        elif side == "value":
+            elem_type, cell_base, info = entries.val_type, entries.val_ptr, entries.val_cell_info
+        else:
+            result.SetError(usage)
+            return
+
+        show = lambda slot: entries.slot_value(slot, f"[{value_summary(entries.slot_key(slot))}]")
+
+    elif odin_type == Odin_Type.SLICE:
+        elem_type = get_data(container).type.GetPointeeType()
+        show      = lambda i: slice_element(container, i)
+
+    elif odin_type == Odin_Type.ARRAY:
+        elem_type = base.type.GetArrayElementType()
+        show      = lambda i: base.CreateChildAtOffset(f"[{i}]", i * elem_type.size, elem_type)
+
+    else:
+        result.SetError(f"'{expr}' is not a slice, array or map")
+        return
+
+    field = find_field(elem_type, path)
+    if field is None:
+        result.SetError(f"{type_display(elem_type)} has no field '{path}'")
+        return
+    offset, field_type = field
+
+    target = map_key_from_text(value_text, field_type, process, frame)
+    if target is None:
+        result.SetError(f"Cannot use '{value_text}' as a {type_display(field_type)}")
+        return
+
+    try:
+        predicate = Find_Predicate(process, offset, field_type, op, target)
+
+        if odin_type == Odin_Type.MAP:
+            matches = find_in_map(entries, cell_base, info, predicate)
+        elif odin_type == Odin_Type.SLICE:
+            matches = find_in_array(process, get_data(container).GetValueAsUnsigned(0), get_len(container), elem_type.size, predicate)
+        else:
+            matches = find_in_array(process, base.load_addr, base.size // elem_type.size if elem_type.size else 0, elem_type.size, predicate)
+
+        count = 0
+        for match in matches:
+            if count < FIND_MAX_RESULTS:
+                result.AppendMessage(str(show(match)))
+            count += 1
+            if first:
+                break
+
+    except (ValueError, struct.error) as e:
+        result.SetError(str(e))
+        return
+
+    if count == 0:
+        result.AppendMessage(f"No match in {expr}")
+    elif count > FIND_MAX_RESULTS:
+        result.AppendMessage(f"... {count - FIND_MAX_RESULTS} more, {count} matches")
@@ -0,0 +1,1226 @@
+#!/usr/bin/env python3
+"""
+Recorded debug sessions for the LLDB Odin formatters.
+
+odin.py only talks to the debugger through the lldb module (SBValue, SBType, SBProcess...).
+This file records the types and the memory the formatters use while stopped in LLDB,
+and implements the part of the lldb module they call on top of such a recording,
+so the formatters can be tested and timed in a plain Python process, without a debugger.
+
+Recording, in an LLDB session stopped in the program:
+    command script import odin.py
+    command script import odin_replay.py
+    odin-record main.rec            every variable of the frame, with its summary and first children
+    odin-record start               or everything the formatters read until
+    odin-record stop main.rec
+
+Replay:
+    ./odin_replay.py main.rec                   prints the variables
+    ./odin_replay.py main.rec --bench [--repeat 50]
+    ./odin_replay.py main.rec -c "p foo" -c "print_children bar"
+    ./test.py --replay main.rec
+
+Recording file:
+    "ODINREC1", u64 little endian length of the header, JSON header, memory
+    The header has the types by id, the frame and global variables, the types found by name,
+    a few process facts and the recorded memory ranges as [address, size, offset into the memory].
+"""
+
+import bisect
+import json
+import mmap
+import re
+import shlex
+import struct
+import sys
+import time
+
+RECORDING_MAGIC  = b"ODINREC1"
+RECORDING_HEADER = struct.Struct("<8sQ")
+
+# Values larger than this are not recorded whole, only the parts the formatters read
+RECORD_VALUE_MAX_BYTES = 1 << 24
+# Recorded ranges are widened to whole pages when the process can read them,
+# so a replay with a different MEMORY_PAGE_SIZE still finds its reads
+RECORD_PAGE_SIZE = 4096
+
+# Children expanded for every variable by `odin-record <file>`, like bench.py
+RECORD_CHILDREN = 100
+
+TYPE_CLASS_NAMES = {
+    "array":       "eTypeClassArray",
+    "builtin":     "eTypeClassBuiltin",
+    "class":       "eTypeClassClass",
+    "enumeration": "eTypeClassEnumeration",
+    "function":    "eTypeClassFunction",
+    "pointer":     "eTypeClassPointer",
+    "reference":   "eTypeClassReference",
+    "struct":      "eTypeClassStruct",
+    "typedef":     "eTypeClassTypedef",
+    "union":       "eTypeClassUnion",
+    "vector":      "eTypeClassVector",
+}
+
+TYPE_FLAG_NAMES = {
+    "builtin": "eTypeIsBuiltIn",
+    "scalar":  "eTypeIsScalar",
+    "integer": "eTypeIsInteger",
+    "float":   "eTypeIsFloat",
+    "signed":  "eTypeIsSigned",
+}
+
+# Basic types that LLDB does not show as a number
+BASIC_TYPE_KINDS = {
+    "eBasicTypeVoid":        "void",
+    "eBasicTypeBool":        "bool",
+    "eBasicTypeChar":        "char",
+    "eBasicTypeSignedChar":  "char",
+    "eBasicTypeUnsignedChar":"char",
+    "eBasicTypeChar8":       "char",
+    "eBasicTypeChar16":      "char16",
+    "eBasicTypeChar32":      "char32",
+    "eBasicTypeWChar":       "char32",
+}
+
+
+# ------------------------------------------------------------------------------
+# Recorder
+#
+# Imported into the session with `command script import odin_replay.py`
+
+# SBValue methods the formatters read a value or get another value with,
+# the values they are called on and the values they return are recorded
+RECORDED_VALUE_METHODS = (
+    "GetChildAtIndex", "GetChildMemberWithName", "CreateChildAtOffset", "CreateValueFromAddress",
+    "Dereference", "GetNonSyntheticValue", "GetSyntheticValue", "GetData", "GetValue", "GetSummary",
+    "GetValueAsUnsigned", "GetValueAsSigned",
+)
+RECORDED_VALUE_PROPERTIES = {"unsigned": "GetValueAsUnsigned", "signed": "GetValueAsSigned"}
+
+class Recorder:
+    def __init__(self, lldb, odin) -> None:
+        self.lldb   = lldb
+        self.odin   = odin
+        self.ranges: set[tuple[int, int]] = set()
+        # FindFirstType and FindFirstGlobalVariable answers, including the types not found
+        self.type_names:   dict[str, object] = {}
+        self.global_names: dict[str, object] = {}
+        # float bytes (hex) -> the value LLDB shows, floats are not formatted by the replay
+        self.float_values: dict[str, str] = {}
+        self.originals: list[tuple[object, str, object]] = []
+
+    @property
+    def active(self) -> bool:
+        return len(self.originals) > 0
+
+    def add_value(self, v) -> None:
+        if not isinstance(v, self.lldb.SBValue) or not v.IsValid():
+            return
+        addr = v.GetLoadAddress()
+        size = v.GetByteSize()
+        if addr != self.lldb.LLDB_INVALID_ADDRESS and 0 < size <= RECORD_VALUE_MAX_BYTES:
+            self.ranges.add((addr, size))
+
+    def patch(self, owner: object, name: str, wrapper: object) -> None:
+        self.originals.append((owner, name, owner.__dict__[name]))
+        setattr(owner, name, wrapper)
+
+    def start(self) -> None:
+        if self.active:
+            return
+
+        for name in RECORDED_VALUE_METHODS:
+            self.patch(self.lldb.SBValue, name, self.recorded_method(self.lldb.SBValue.__dict__[name]))
+        self.patch(self.lldb.SBValue, "GetValue", self.recorded_float_value(self.lldb.SBValue.GetValue))
+        for name, method in RECORDED_VALUE_PROPERTIES.items():
+            self.patch(self.lldb.SBValue, name, property(self.lldb.SBValue.__dict__[method]))
+
+        self.patch(self.lldb.SBTarget, "FindFirstType",           self.recorded_lookup(self.type_names,   self.lldb.SBTarget.FindFirstType))
+        self.patch(self.lldb.SBTarget, "FindFirstGlobalVariable", self.recorded_lookup(self.global_names, self.lldb.SBTarget.FindFirstGlobalVariable))
+
+        # reads of the page cache and other direct reads
+        read = self.odin.process_read_memory
+        def recorded_read(process, addr: int, size: int) -> bytes | None:
+            data = read(process, addr, size)
+            if data:
+                self.ranges.add((addr, len(data)))
+            return data
+        self.originals.append((self.odin, "process_read_memory", read))
+        self.odin.process_read_memory = recorded_read
+
+    def stop(self) -> None:
+        for owner, name, original in reversed(self.originals):
+            setattr(owner, name, original)
+        self.originals.clear()
+
+    def recorded_method(self, fn):
+        def wrapper(value, *args):
+            self.add_value(value)
+            result = fn(value, *args)
+            self.add_value(result)
+            return result
+        wrapper.__name__ = fn.__name__
+        return wrapper
+
+    def recorded_float_value(self, fn):
+        def wrapper(value):
+            text = fn(value)
+            if text is not None and value.GetType().GetCanonicalType().GetTypeFlags() & self.lldb.eTypeIsFloat:
+                error = self.lldb.SBError()
+                data  = value.GetData()
+                raw   = data.ReadRawData(error, 0, data.GetByteSize())
+                if error.Success():
+                    self.float_values[raw.hex()] = text
+            return text
+        wrapper.__name__ = fn.__name__
+        return wrapper
+
+    def recorded_lookup(self, found: dict, fn):
+        def wrapper(target, name: str):
+            result = fn(target, name)
+            found[name] = result
+            self.add_value(result)
+            return result
+        wrapper.__name__ = fn.__name__
+        return wrapper
+
+    def visit(self, value, children: int) -> None:
+        """Formats the value and its first children the way LLDB shows a variable."""
+        value.GetSummary()
+        value.GetValue()
+        for i in range(min(value.GetNumChildren(children), children)):
+            child = value.GetChildAtIndex(i)
+            child.GetSummary()
+            child.GetValue()
+
+    def write(self, path: str, target, frame) -> dict:
+        lldb    = self.lldb
+        process = target.GetProcess()
+        types   = Type_Recorder(lldb)
+        order   = "little" if process.GetByteOrder() == lldb.eByteOrderLittle else "big"
+
+        variables = []
+        for v in frame.GetVariables(True, True, True, True):
+            variables.append(self.value_record(v, types))
+            self.add_value(v)
+
+        globals_ = {name: self.value_record(v, types) for name, v in self.global_names.items() if v.IsValid()}
+        for v in self.global_names.values():
+            self.add_value(v)
+
+        type_names = {name: types.add(t) if t.IsValid() else None for name, t in self.type_names.items()}
+
+        memory, ranges = self.read_ranges(process)
+
+        header = {
+            "version":       2,
+            "executable":    target.GetExecutable().fullpath,
+            "modules":       target.GetNumModules(),
+            "byte_order":    order,
+            "address_size":  process.GetAddressByteSize(),
+            "unique_id":     process.GetUniqueID(),
+            "stop_id":       process.GetStopID(True),
+            "types":         types.records,
+            "type_names":    type_names,
+            "variables":     variables,
+            "globals":       globals_,
+            "ranges":        ranges,
+            "float_values":  self.float_values,
+        }
+        encoded = json.dumps(header, separators=(",", ":")).encode()
+
+        with open(path, "wb") as f:
+            f.write(RECORDING_HEADER.pack(RECORDING_MAGIC, len(encoded)))
+            f.write(encoded)
+            f.write(memory)
+
+        return {"types": len(types.records), "variables": len(variables), "ranges": len(ranges), "bytes": len(memory)}
+
+    def value_record(self, v, types: "Type_Recorder") -> dict:
+        record = {"name": v.GetName(), "type": types.add(v.GetType())}
+        addr   = v.GetLoadAddress()
+        if addr != self.lldb.LLDB_INVALID_ADDRESS:
+            record["address"] = addr
+        else:
+            error = self.lldb.SBError()
+            data  = v.GetData()
+            record["data"] = data.ReadRawData(error, 0, data.GetByteSize()).hex() if data.GetByteSize() else ""
+        return record
+
+    def read_ranges(self, process) -> tuple[bytes, list[list[int]]]:
+        """Reads the recorded ranges widened to pages, merging the ranges that overlap or touch."""
+        read = self.odin.process_read_memory
+
+        chunks: list[tuple[int, bytes]] = []
+        for addr, size in sorted(self.ranges):
+            start = addr & ~(RECORD_PAGE_SIZE - 1)
+            end   = (addr + size + RECORD_PAGE_SIZE - 1) & ~(RECORD_PAGE_SIZE - 1)
+            if chunks and chunks[-1][0] + len(chunks[-1][1]) >= addr + size:
+                continue
+            data = read(process, start, end - start)
+            if data is None or len(data) != end - start:
+                start = addr
+                data  = read(process, addr, size)
+                if data is None:
+                    continue
+            chunks.append((start, data))
+
+        memory = bytearray()
+        ranges: list[list[int]] = []
+        for start, data in chunks:
+            if ranges and ranges[-1][0] + ranges[-1][1] >= start:
+                last = ranges[-1]
+                skip = last[0] + last[1] - start
+                memory += data[skip:]
+                last[1] = max(last[1], start + len(data) - last[0])
+            else:
+                ranges.append([start, len(data), len(memory)])
+                memory += data
+
+        return bytes(memory), ranges
+
+class Type_Recorder:
+    """Assigns ids to the types of a recording and records every type they refer to."""
+
+    def __init__(self, lldb) -> None:
+        self.lldb    = lldb
+        self.ids:    dict[tuple, int] = {}
+        self.records: list[dict]      = []
+
+        self.classes = [(name, getattr(lldb, constant)) for name, constant in TYPE_CLASS_NAMES.items() if hasattr(lldb, constant)]
+        self.flags   = [(name, getattr(lldb, constant)) for name, constant in TYPE_FLAG_NAMES.items()  if hasattr(lldb, constant)]
+        self.kinds   = {getattr(lldb, constant): kind for constant, kind in BASIC_TYPE_KINDS.items()    if hasattr(lldb, constant)}
+
+    def add(self, t) -> int | None:
+        if t is None or not t.IsValid():
+            return None
+
+        cls = t.GetTypeClass()
+        key = (t.GetName(), cls, t.GetByteSize(), t.GetNumberOfFields())
+        id  = self.ids.get(key)
+        if id is not None:
+            return id
+
+        id = self.ids[key] = len(self.records)
+        record: dict = {"name": t.GetName(), "size": t.GetByteSize()}
+        self.records.append(record)
+
+        record["class"] = next((name for name, value in self.classes if cls == value), "other")
+
+        flags = t.GetTypeFlags()
+        record["flags"] = [name for name, value in self.flags if flags & value]
+
+        kind = self.kinds.get(t.GetBasicType())
+        if kind:
+            record["kind"] = kind
+
+        if record["class"] in ("struct", "union", "class"):
+            record["fields"] = []
+            for i in range(t.GetNumberOfFields()):
+                field = t.GetFieldAtIndex(i)
+                bits  = field.GetBitfieldSizeInBits() if field.IsBitfield() else 0
+                record["fields"].append([field.GetName(), self.add(field.GetType()), field.GetOffsetInBits(), bits])
+
+        elif record["class"] == "array":
+            element = t.GetArrayElementType()
+            record["element"] = self.add(element)
+            record["count"]   = t.GetByteSize() // element.GetByteSize() if element.GetByteSize() else 0
+
+        elif record["class"] in ("pointer", "reference"):
+            record["pointee"] = self.add(t.GetPointeeType())
+
+        elif record["class"] == "enumeration":
+            members = t.GetEnumMembers()
+            record["members"] = [[m.GetName(), m.GetValueAsSigned()] for m in (members.GetTypeEnumMemberAtIndex(i) for i in range(members.GetSize()))]
+            record["integer"] = self.add(t.GetEnumerationIntegerType())
+
+        elif record["class"] == "typedef":
+            record["typedef"] = self.add(t.GetTypedefedType())
+
+        elif record["class"] == "function":
+            record["return"] = self.add(t.GetFunctionReturnType())
+            args = t.GetFunctionArgumentTypes()
+            record["args"] = [self.add(args.GetTypeAtIndex(i)) for i in range(args.GetSize())]
+
+        canonical = t.GetCanonicalType()
+        if canonical.IsValid() and canonical.GetName() != t.GetName():
+            record["canonical"] = self.add(canonical)
+
+        return id
+
+RECORDER: Recorder | None = None
+
+def clear_caches(odin) -> None:
+    """Cached summaries, pages and formats would not be read (or checked against LLDB) again."""
+    odin.STOP_CACHE.clear()
+    odin.MEMORY_CACHE.clear()
+    odin.PRIMITIVE_FORMATS.clear()
+    odin.PLAIN_FORMATS.clear()
+
+def record_command(debugger, command, result, _dict) -> None:
+    """odin-record <file> | start | stop <file> -- records the types and memory the formatters use"""
+    global RECORDER
+
+    import lldb
+    import odin
+
+    args   = command.split()
+    target = debugger.GetSelectedTarget()
+    frame  = target.GetProcess().GetSelectedThread().GetSelectedFrame()
+
+    if not args or (args[0] == "stop" and len(args) < 2):
+        result.SetError("Usage: odin-record <file> | start | stop <file>")
+        return
+
+    if args[0] == "start":
+        if RECORDER is None:
+            RECORDER = Recorder(lldb, odin)
+        RECORDER.start()
+        clear_caches(odin)
+        result.AppendMessage("Recording started")
+        return
+
+    if args[0] == "stop":
+        path = args[1]
+        if RECORDER is None:
+            result.SetError("Not recording, run odin-record start first")
+            return
+    else:
+        path = args[0]
+        if RECORDER is None:
+            RECORDER = Recorder(lldb, odin)
+        RECORDER.start()
+        clear_caches(odin)
+        for v in frame.GetVariables(True, True, True, True):
+            RECORDER.visit(v, RECORD_CHILDREN)
+
+    RECORDER.stop()
+    try:
+        counts = RECORDER.write(path, target, frame)
+    finally:
+        RECORDER = None
+
+    result.AppendMessage(f"Recorded {counts['variables']} variables, {counts['types']} types and {counts['bytes']} bytes in {counts['ranges']} ranges to {path}")
+
+def __lldb_init_module(debugger, internal_dict):
+    debugger.HandleCommand("command script add -f odin_replay.record_command odin-record")
+
+
+# ------------------------------------------------------------------------------
+# Replay
+#
+# The classes and constants below are the part of the lldb module used by odin.py
+# and print_children.py. load() installs this module as `lldb` and imports odin.
+
+eTypeClassInvalid     = 0
+eTypeClassArray       = 1 << 0
+eTypeClassBuiltin     = 1 << 2
+eTypeClassClass       = 1 << 3
+eTypeClassEnumeration = 1 << 6
+eTypeClassFunction    = 1 << 7
+eTypeClassPointer     = 1 << 12
+eTypeClassReference   = 1 << 13
+eTypeClassStruct      = 1 << 14
+eTypeClassUnion       = 1 << 15
+eTypeClassTypedef     = 1 << 16
+eTypeClassVector      = 1 << 17
+eTypeClassOther       = 1 << 31
+
+eTypeIsBuiltIn = 1 << 4
+eTypeIsScalar  = 1 << 17
+eTypeIsInteger = 1 << 18
+eTypeIsFloat   = 1 << 19
+eTypeIsSigned  = 1 << 21
+
+eBasicTypeInvalid = 0
+eBasicTypeVoid    = 1
+eBasicTypeOther   = 2
+eBasicTypeBool    = 3
+
+eByteOrderInvalid = 0
+eByteOrderBig     = 1
+eByteOrderLittle  = 4
+
+eReturnStatusSuccessFinishResult = 2
+eReturnStatusFailed              = 6
+
+LLDB_INVALID_ADDRESS = 0xffffffffffffffff
+UINT32_MAX           = 0xffffffff
+
+REPLAY_TYPE_CLASSES = {name: globals()[constant] for name, constant in TYPE_CLASS_NAMES.items()}
+REPLAY_TYPE_FLAGS   = {name: globals()[constant] for name, constant in TYPE_FLAG_NAMES.items()}
+
+class Recording:
+    """A recording file, the memory is read from a memory-mapped view of it."""
+
+    def __init__(self, path: str) -> None:
+        self.file   = open(path, "rb")
+        self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, length = RECORDING_HEADER.unpack_from(self.buffer, 0)
+        if magic != RECORDING_MAGIC:
+            raise ValueError(f"{path} is not an Odin LLDB recording")
+
+        self.header = json.loads(self.buffer[RECORDING_HEADER.size:RECORDING_HEADER.size + length])
+        base        = RECORDING_HEADER.size + length
+
+        self.byte_order   = self.header["byte_order"]
+        self.address_size = self.header["address_size"]
+        self.ranges       = [(addr, size, base + offset) for addr, size, offset in self.header["ranges"]]
+        self.starts       = [addr for addr, _, _ in self.ranges]
+        self.types        = load_types(self.header["types"])
+        self.float_values = self.header.get("float_values", {})
+
+    def read(self, addr: int, size: int) -> bytes | None:
+        i = bisect.bisect_right(self.starts, addr) - 1
+        if i < 0:
+            return None
+        start, length, offset = self.ranges[i]
+        if addr + size > start + length:
+            return None
+        offset += addr - start
+        return self.buffer[offset:offset + size]
+
+    def type(self, id: int | None) -> "SBType":
+        return self.types[id] if id is not None else SBType()
+
+    def value(self, record: dict) -> "SBValue":
+        t = self.type(record["type"])
+        if "address" in record:
+            return SBValue(t, record["name"], record["address"])
+        return SBValue(t, record["name"], data=bytes.fromhex(record["data"]))
+
+    def close(self) -> None:
+        self.buffer.close()
+        self.file.close()
+
+def load_types(records: list[dict]) -> list["SBType"]:
+    types = [SBType(r["name"], REPLAY_TYPE_CLASSES.get(r["class"], eTypeClassOther), r["size"]) for r in records]
+
+    for t, r in zip(types, records):
+        for name in r["flags"]:
+            t.flags |= REPLAY_TYPE_FLAGS[name]
+        t.kind = r.get("kind")
+
+        ref = lambda key: types[r[key]] if r.get(key) is not None else None
+        t.fields    = [SBTypeMember(name, types[id] if id is not None else SBType(), offset, bits) for name, id, offset, bits in r.get("fields", ())]
+        t.pointee   = ref("pointee")
+        t.element   = ref("element")
+        t.count     = r.get("count", 0)
+        t.members   = [SBTypeEnumMember(name, value, t.size) for name, value in r.get("members", ())]
+        t.integer   = ref("integer")
+        t.typedef   = ref("typedef")
+        t.canonical = ref("canonical")
+        t.result    = ref("return")
+        t.arguments = [types[id] for id in r.get("args", ()) if id is not None]
+
+    return types
+
+RECORDING: Recording | None = None
+
+def recording() -> Recording:
+    if RECORDING is None:
+        raise RuntimeError("No recording loaded, call odin_replay.load(path) first")
+    return RECORDING
+
+class SBError:
+    def __init__(self) -> None:
+        self.message = ""
+
+    def SetErrorString(self, message: str) -> None: self.message = message
+    def Success(self)   -> bool: return not self.message
+    def Fail(self)      -> bool: return bool(self.message)
+    def GetCString(self) -> str: return self.message
+    def IsValid(self)   -> bool: return True
+    def __str__(self)   -> str: return self.message
+
+    success = property(Success)
+    fail    = property(Fail)
+
+class SBTypeMember:
+    def __init__(self, name: str | None = None, t: "SBType | None" = None, bit_offset: int = 0, bitfield_bits: int = 0) -> None:
+        self.name          = name
+        self.type          = t if t is not None else SBType()
+        self.bit_offset    = bit_offset
+        self.byte_offset   = bit_offset // 8
+        self.bitfield_bits = bitfield_bits
+
+    def IsValid(self)               -> bool: return self.name is not None
+    def GetName(self)               -> str | None: return self.name
+    def GetType(self)               -> "SBType": return self.type
+    def GetOffsetInBytes(self)      -> int: return self.byte_offset
+    def GetOffsetInBits(self)       -> int: return self.bit_offset
+    def IsBitfield(self)            -> bool: return self.bitfield_bits > 0
+    def GetBitfieldSizeInBits(self) -> int: return self.bitfield_bits
+
+    is_bitfield       = property(IsBitfield)
+    bitfield_bit_size = property(GetBitfieldSizeInBits)
+
+class SBTypeEnumMember:
+    def __init__(self, name: str, value: int, size: int) -> None:
+        self.name     = name
+        self.signed   = value
+        self.unsigned = value & ((1 << (size*8)) - 1) if size else value
+
+    def IsValid(self)            -> bool: return True
+    def GetName(self)            -> str: return self.name
+    def GetValueAsSigned(self)   -> int: return self.signed
+    def GetValueAsUnsigned(self) -> int: return self.unsigned
+
+class SBTypeEnumMemberList(list):
+    def IsValid(self) -> bool: return True
+    def GetSize(self) -> int: return len(self)
+    def GetTypeEnumMemberAtIndex(self, i: int) -> SBTypeEnumMember: return self[i]
+
+class SBTypeList(list):
+    def IsValid(self) -> bool: return True
+    def GetSize(self) -> int: return len(self)
+    def GetTypeAtIndex(self, i: int) -> "SBType": return self[i] if 0 <= i < len(self) else SBType()
+
+class SBType:
+    def __init__(self, name: str = "", cls: int = eTypeClassInvalid, size: int = 0) -> None:
+        self.name      = name
+        self.type      = cls
+        self.size      = size
+        self.flags     = 0
+        self.kind: str | None = None
+        self.fields:    list[SBTypeMember]     = []
+        self.pointee:   "SBType | None"        = None
+        self.element:   "SBType | None"        = None
+        self.count     = 0
+        self.members:   list[SBTypeEnumMember] = []
+        self.integer:   "SBType | None"        = None
+        self.typedef:   "SBType | None"        = None
+        self.canonical: "SBType | None"        = None
+        self.result:    "SBType | None"        = None
+        self.arguments: list["SBType"]         = []
+        self.derived:   dict                   = {}
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, SBType) and (self is other or (other.name == self.name and other.type == self.type and other.size == self.size))
+
+    def __hash__(self) -> int:
+        return hash(self.name)
+
+    def __repr__(self) -> str:
+        return f"SBType({self.name})"
+
+    def IsValid(self)            -> bool: return self.type != eTypeClassInvalid
+    def GetName(self)            -> str: return self.name
+    def GetDisplayTypeName(self) -> str: return self.name
+    def GetTypeClass(self)       -> int: return self.type
+    def GetByteSize(self)        -> int: return self.size
+    def GetTypeFlags(self)       -> int: return self.flags
+    def IsPointerType(self)      -> bool: return self.type == eTypeClassPointer
+    def IsReferenceType(self)    -> bool: return self.type == eTypeClassReference
+    def IsTypedefType(self)      -> bool: return self.type == eTypeClassTypedef
+    def GetNumberOfFields(self)  -> int: return len(self.fields)
+
+    is_pointer   = property(IsPointerType)
+    is_reference = property(IsReferenceType)
+    num_fields   = property(GetNumberOfFields)
+
+    def GetBasicType(self) -> int:
+        if self.kind == "void":
+            return eBasicTypeVoid
+        if self.kind == "bool":
+            return eBasicTypeBool
+        return eBasicTypeOther if self.type == eTypeClassBuiltin else eBasicTypeInvalid
+
+    def GetFieldAtIndex(self, i: int) -> SBTypeMember:
+        return self.fields[i] if 0 <= i < len(self.fields) else SBTypeMember()
+
+    def GetPointeeType(self)             -> "SBType": return self.pointee   or SBType()
+    def GetArrayElementType(self)        -> "SBType": return self.element   or SBType()
+    def GetEnumerationIntegerType(self)  -> "SBType": return self.integer   or SBType()
+    def GetTypedefedType(self)           -> "SBType": return self.typedef   or self
+    def GetCanonicalType(self)           -> "SBType": return self.canonical or self
+    def GetUnqualifiedType(self)         -> "SBType": return self
+    def GetFunctionReturnType(self)      -> "SBType": return self.result    or SBType()
+    def GetFunctionArgumentTypes(self)   -> SBTypeList: return SBTypeList(self.arguments)
+    def GetEnumMembers(self) -> SBTypeEnumMemberList: return SBTypeEnumMemberList(self.members)
+
+    def GetPointerType(self) -> "SBType":
+        t = self.derived.get("*")
+        if t is None:
+            t = self.derived["*"] = SBType(f"{self.name} *", eTypeClassPointer, recording().address_size)
+            t.flags   = REPLAY_TYPE_FLAGS["scalar"]
+            t.pointee = self
+        return t
+
+    def GetArrayType(self, count: int) -> "SBType":
+        t = self.derived.get(count)
+        if t is None:
+            t = self.derived[count] = SBType(f"{self.name}[{count}]", eTypeClassArray, self.size*count)
+            t.element = self
+            t.count   = count
+        return t
+
+class SBData:
+    def __init__(self, raw: bytes = b"") -> None:
+        self.raw = bytes(raw)
+
+    def SetData(self, error: SBError, raw: bytes, order: int, address_size: int) -> None:
+        self.raw = bytes(raw)
+
+    def ReadRawData(self, error: SBError, offset: int, size: int) -> bytes | None:
+        if offset + size > len(self.raw):
+            error.SetErrorString("out of bounds")
+            return None
+        return self.raw[offset:offset + size]
+
+    def IsValid(self)     -> bool: return True
+    def GetByteSize(self) -> int: return len(self.raw)
+
+    size = property(GetByteSize)
+
+    @staticmethod
+    def CreateDataFromInt(value: int, size: int = 8, target_byte_order: int = eByteOrderLittle, target_addr_size: int = 8) -> "SBData":
+        order = "little" if target_byte_order == eByteOrderLittle else "big"
+        return SBData((value & ((1 << (size*8)) - 1)).to_bytes(size, order))
+
+class SBSyntheticValueProvider:
+    def __init__(self, valobj) -> None:
+        pass
+
+# Formatters registered with `type summary add` and `type synth add` through SBDebugger.HandleCommand,
+# LLDB tries the names, then the regular expressions, then the recognizer functions
+REGISTRY: list[dict] = []
+REGISTRY_TIERS = ("exact", "regex", "recognizer")
+
+def resolve(dotted: str):
+    module, _, name = dotted.rpartition(".")
+    return getattr(sys.modules[module], name)
+
+def registry_find(kind: str, t: SBType) -> dict | None:
+    for tier in REGISTRY_TIERS:
+        for entry in reversed(REGISTRY):
+            if entry["kind"] != kind or entry["tier"] != tier:
+                continue
+            if tier == "exact":
+                matched = entry["match"] == t.name
+            elif tier == "regex":
+                matched = re.search(entry["match"], t.name) is not None
+            else:
+                matched = bool(resolve(entry["match"])(t, {}))
+            if matched:
+                return entry
+    return None
+
+def char_text(code: int, prefix: str = "") -> str:
+    escapes = {0: "\\0", 7: "\\a", 8: "\\b", 9: "\\t", 10: "\\n", 11: "\\v", 12: "\\f", 13: "\\r", 39: "\\'", 92: "\\\\"}
+    if code in escapes:
+        return f"{prefix}'{escapes[code]}'"
+    if 32 <= code < 127 or (prefix and code > 127):
+        return f"{prefix}'{chr(code)}'"
+    return f"{prefix}'\\x{code:02x}'"
+
+class SBValue:
+    def __init__(self, t: SBType | None = None, name: str | None = None, addr: int | None = None,
+                 data: bytes | None = None, synthetic: bool = True) -> None:
+        self.type       = t if t is not None else SBType()
+        self.name       = name
+        self.addr       = addr
+        self.data       = data
+        self.synthetic  = synthetic
+        self.provider_: object = None
+        self.looked_up  = False
+
+    def __repr__(self) -> str:
+        return f"SBValue({self.name}: {self.type.name})"
+
+    # what LLDB prints for a value, like `frame variable`
+    def __str__(self) -> str:
+        try:
+            return f"({self.type.name}) {self.name} = {value_text(self)}"
+        except ValueError:
+            return f"({self.type.name}) {self.name}"
+
+    # a typedef has the children and the value of the type it names
+    @property
+    def layout(self) -> SBType:
+        return self.type.canonical if self.type.type == eTypeClassTypedef and self.type.canonical else self.type
+
+    def raw(self) -> bytes | None:
+        if self.data is None and self.addr is not None:
+            self.data = recording().read(self.addr, self.type.size)
+        return self.data
+
+    def IsValid(self)         -> bool: return self.type.IsValid()
+    def GetName(self)         -> str | None: return self.name
+    def GetType(self)         -> SBType: return self.type
+    def GetByteSize(self)     -> int: return self.type.size
+    def GetLoadAddress(self)  -> int: return self.addr if self.addr is not None else LLDB_INVALID_ADDRESS
+    def GetProcess(self)      -> "SBProcess": return PROCESS
+    def GetTarget(self)       -> "SBTarget": return TARGET
+    def GetFrame(self)        -> "SBFrame": return FRAME
+
+    size      = property(GetByteSize)
+    load_addr = property(GetLoadAddress)
+    process   = property(GetProcess)
+    target    = property(GetTarget)
+
+    def GetError(self) -> SBError:
+        error = SBError()
+        if not self.IsValid():
+            error.SetErrorString("invalid value")
+        elif self.raw() is None:
+            error.SetErrorString(f"memory at 0x{self.load_addr:x} was not recorded")
+        return error
+
+    def GetData(self) -> SBData:
+        return SBData(self.raw() or b"")
+
+    def provider(self):
+        if not self.synthetic:
+            return None
+        if not self.looked_up:
+            self.looked_up = True
+            entry = registry_find("synth", self.type)
+            if entry is not None:
+                self.provider_ = resolve(entry["function"])(self.GetNonSyntheticValue(), {})
+                self.provider_.update()
+        return self.provider_
+
+    def IsSynthetic(self) -> bool:
+        return self.provider() is not None
+
+    def GetNonSyntheticValue(self) -> "SBValue":
+        return SBValue(self.type, self.name, self.addr, self.data, False)
+
+    def GetSyntheticValue(self) -> "SBValue":
+        return SBValue(self.type, self.name, self.addr, self.data, True)
+
+    def child(self, name: str, offset: int, t: SBType) -> "SBValue":
+        if self.addr is not None:
+            return SBValue(t, name, self.addr + offset)
+        raw = self.raw() or b""
+        return SBValue(t, name, data=raw[offset:offset + t.size])
+
+    def raw_children(self) -> list["SBValue"]:
+        t = self.layout
+        if t.type in (eTypeClassStruct, eTypeClassUnion, eTypeClassClass):
+            return [self.child(f.name, f.byte_offset, f.type) for f in t.fields]
+        if t.type == eTypeClassArray and t.element is not None:
+            return [self.child(f"[{i}]", i*t.element.size, t.element) for i in range(t.count)]
+        if t.type == eTypeClassPointer and t.pointee is not None and self.unsigned:
+            pointee = self.Dereference()
+            if pointee.layout.type in (eTypeClassStruct, eTypeClassUnion, eTypeClassClass):
+                return pointee.GetNonSyntheticValue().raw_children()
+            if pointee.layout.type != eTypeClassFunction and pointee.type.size > 0:
+                return [pointee]
+        return []
+
+    def GetNumChildren(self, max: int = UINT32_MAX) -> int:
+        provider = self.provider()
+        count    = provider.num_children() if provider is not None else len(self.raw_children())
+        return min(count, max)
+
+    num_children = property(GetNumChildren)
+
+    def MightHaveChildren(self) -> bool:
+        return self.GetNumChildren() > 0
+
+    def GetChildAtIndex(self, i: int, *_) -> "SBValue":
+        provider = self.provider()
+        if provider is not None:
+            child = provider.get_child_at_index(i)
+            return child if child is not None else SBValue()
+        children = self.raw_children()
+        return children[i] if 0 <= i < len(children) else SBValue()
+
+    @property
+    def children(self) -> list["SBValue"]:
+        return [self.GetChildAtIndex(i) for i in range(self.GetNumChildren())]
+
+    def GetIndexOfChildWithName(self, name: str) -> int:
+        provider = self.provider()
+        if provider is not None and hasattr(provider, "get_child_index"):
+            i = provider.get_child_index(name)
+            return i if i is not None and i >= 0 else UINT32_MAX
+        for i, child in enumerate(self.raw_children()):
+            if child.name == name:
+                return i
+        return UINT32_MAX
+
+    def GetChildMemberWithName(self, name: str, *_) -> "SBValue":
+        i = self.GetIndexOfChildWithName(name)
+        return self.GetChildAtIndex(i) if i != UINT32_MAX else SBValue()
+
+    def int_value(self, signed: bool, default: int = 0) -> int:
+        raw = self.raw()
+        if not raw or len(raw) > 16:
+            return default
+        return int.from_bytes(raw, recording().byte_order, signed=signed)
+
+    def GetValueAsUnsigned(self, default: int = 0) -> int: return self.int_value(False, default)
+    def GetValueAsSigned(self, default: int = 0)   -> int: return self.int_value(True,  default)
+
+    unsigned = property(GetValueAsUnsigned)
+    signed   = property(GetValueAsSigned)
+
+    def GetValue(self) -> str | None:
+        t   = self.layout
+        raw = self.raw()
+        if raw is None or len(raw) < t.size:
+            return None
+
+        if t.type == eTypeClassPointer:
+            return f"0x{self.unsigned:0{recording().address_size*2}x}"
+
+        if t.type == eTypeClassEnumeration:
+            number = self.signed if (t.integer and t.integer.flags & eTypeIsSigned) else self.unsigned
+            for member in t.members:
+                if number in (member.signed, member.unsigned):
+                    return member.name
+            return str(number)
+
+        if t.type != eTypeClassBuiltin or t.size == 0:
+            return None
+
+        code = int.from_bytes(raw, recording().byte_order)
+        if t.kind == "bool":
+            return "true" if code else "false"
+        if t.kind == "char":
+            return char_text(code)
+        if t.kind == "char16":
+            return char_text(code, "u")
+        if t.kind == "char32":
+            return char_text(code, "U")
+        if t.flags & eTypeIsFloat:
+            # as LLDB showed it while recording, None for the floats it was never asked about
+            return recording().float_values.get(raw[:t.size].hex())
+        if t.flags & eTypeIsInteger:
+            return str(self.signed if t.flags & eTypeIsSigned else self.unsigned)
+        return None
+
+    def summary_entry(self) -> dict | None:
+        return registry_find("summary", self.type) if self.IsValid() else None
+
+    def GetSummary(self) -> str | None:
+        entry = self.summary_entry()
+        if entry is None:
+            return None
+        return resolve(entry["function"])(self, {})
+
+    def Dereference(self) -> "SBValue":
+        if self.layout.type not in (eTypeClassPointer, eTypeClassReference):
+            return SBValue()
+        addr = self.unsigned
+        if addr == 0:
+            return SBValue()
+        return SBValue(self.layout.GetPointeeType(), f"*{self.name}", addr)
+
+    deref = property(Dereference)
+
+    def CreateChildAtOffset(self, name: str, offset: int, t: SBType) -> "SBValue":
+        if self.layout.type == eTypeClassPointer:
+            return SBValue(t, name, self.unsigned + offset)
+        return self.child(name, offset, t)
+
+    def CreateValueFromAddress(self, name: str, addr: int, t: SBType) -> "SBValue":
+        return SBValue(t, name, addr)
+
+    def CreateValueFromData(self, name: str, data: SBData, t: SBType) -> "SBValue":
+        return SBValue(t, name, data=data.raw[:t.size] if t.size else data.raw)
+
+class SBValueList(list):
+    def IsValid(self) -> bool: return True
+    def GetSize(self) -> int: return len(self)
+    def GetValueAtIndex(self, i: int) -> SBValue: return self[i] if 0 <= i < len(self) else SBValue()
+
+class SBFileSpec:
+    def __init__(self, path: str) -> None:
+        self.fullpath = path
+
+class SBProcess:
+    def IsValid(self)           -> bool: return RECORDING is not None
+    def GetByteOrder(self)      -> int: return eByteOrderLittle if recording().byte_order == "little" else eByteOrderBig
+    def GetAddressByteSize(self) -> int: return recording().address_size
+    def GetUniqueID(self)       -> int: return recording().header["unique_id"]
+    def GetStopID(self, include_expression_stops: bool = False) -> int: return recording().header["stop_id"]
+    def GetTarget(self)         -> "SBTarget": return TARGET
+    def GetSelectedThread(self) -> "SBThread": return THREAD
+
+    def ReadMemory(self, addr: int, size: int, error: SBError) -> bytes | None:
+        data = recording().read(addr, size)
+        if data is None:
+            error.SetErrorString(f"memory read failed for 0x{addr:x}")
+        return data
+
+    def ReadUnsignedFromMemory(self, addr: int, size: int, error: SBError) -> int:
+        data = self.ReadMemory(addr, size, error)
+        return int.from_bytes(data, recording().byte_order) if data else 0
+
+    def ReadPointerFromMemory(self, addr: int, error: SBError) -> int:
+        return self.ReadUnsignedFromMemory(addr, recording().address_size, error)
+
+class SBTarget:
+    def IsValid(self)            -> bool: return RECORDING is not None
+    def GetProcess(self)         -> SBProcess: return PROCESS
+    def GetNumModules(self)      -> int: return recording().header["modules"]
+    def GetExecutable(self)      -> SBFileSpec: return SBFileSpec(recording().header["executable"])
+    def GetByteOrder(self)       -> int: return PROCESS.GetByteOrder()
+    def GetAddressByteSize(self) -> int: return PROCESS.GetAddressByteSize()
+
+    def FindFirstType(self, name: str) -> SBType:
+        id = recording().header["type_names"].get(name)
+        if id is not None:
+            return recording().type(id)
+        # the types of the recording, for names the formatters did not look up while recording
+        for t in recording().types:
+            if t.name == name:
+                return t
+        return SBType()
+
+    def FindFirstGlobalVariable(self, name: str) -> SBValue:
+        record = recording().header["globals"].get(name)
+        return recording().value(record) if record else SBValue()
+
+class SBThread:
+    def IsValid(self)          -> bool: return True
+    def GetSelectedFrame(self) -> "SBFrame": return FRAME
+
+class SBFrame:
+    def IsValid(self) -> bool: return RECORDING is not None
+
+    def GetVariables(self, *_) -> SBValueList:
+        return SBValueList(recording().value(record) for record in recording().header["variables"])
+
+    def FindVariable(self, name: str) -> SBValue:
+        for record in recording().header["variables"]:
+            if record["name"] == name:
+                return recording().value(record)
+        return SBValue()
+
+    def GetValueForVariablePath(self, path: str) -> SBValue:
+        match = re.match(r"\s*(\w+)(.*)$", path)
+        if match is None:
+            return SBValue()
+
+        value = self.FindVariable(match[1])
+        rest  = match[2].strip()
+        while rest and value.IsValid():
+            part = re.match(r"\.(\w+)|->(\w+)|(\[[^\]]*\])", rest)
+            if part is None:
+                return SBValue()
+            value = value.GetChildMemberWithName(part[1] or part[2] or part[3])
+            rest  = rest[part.end():]
+        return value if not rest else SBValue()
+
+    # expressions are not evaluated, only variable paths
+    def EvaluateExpression(self, expression: str) -> SBValue:
+        return self.GetValueForVariablePath(expression)
+
+class SBCommandReturnObject:
+    def __init__(self) -> None:
+        self.output: list[str] = []
+        self.errors: list[str] = []
+        self.status = eReturnStatusSuccessFinishResult
+
+    def AppendMessage(self, message: str) -> None: self.output.append(message)
+    def AppendWarning(self, message: str) -> None: self.output.append(f"warning: {message}")
+    def SetStatus(self, status: int)      -> None: self.status = status
+    def Succeeded(self)                   -> bool: return self.status != eReturnStatusFailed
+    def GetOutput(self)                   -> str: return "".join(f"{line}\n" for line in self.output)
+    def GetError(self)                    -> str: return "".join(f"error: {line}\n" for line in self.errors)
+
+    def SetError(self, message) -> None:
+        self.errors.append(str(message))
+        self.status = eReturnStatusFailed
+
+class SBDebugger:
+    def __init__(self) -> None:
+        self.commands: dict[str, str] = {}
+
+    def IsValid(self)           -> bool: return True
+    def GetSelectedTarget(self) -> SBTarget: return TARGET
+
+    def HandleCommand(self, command: str) -> None:
+        """Registers the formatters and commands, other commands are ignored."""
+        tokens = shlex.split(command)
+
+        if tokens[:3] == ["command", "script", "add"]:
+            self.commands[tokens[-1]] = tokens[tokens.index("-f") + 1]
+            return
+
+        if len(tokens) < 3 or tokens[0] != "type" or tokens[1] not in ("summary", "synth"):
+            return
+
+        kind = tokens[1]
+        if tokens[2] == "delete":
+            names = [token for token in tokens[3:] if not token.startswith("-")]
+            REGISTRY[:] = [e for e in REGISTRY if not (e["kind"] == kind and e["tier"] != "recognizer" and e["match"] in names)]
+            return
+        if tokens[2] != "add":
+            return
+
+        entry = {"kind": kind, "function": None, "no_value": False}
+        regex = False
+        names = []
+        i     = 3
+        while i < len(tokens):
+            token = tokens[i]
+            if token in ("--python-function", "-F", "--python-class", "-l"):
+                entry["function"] = tokens[i + 1]
+                i += 2
+            elif token == "--recognizer-function":
+                entry["tier"], entry["match"] = "recognizer", tokens[i + 1]
+                i += 2
+            elif token in ("--category", "-w"):
+                i += 2
+            elif token in ("-x", "--regex"):
+                regex = True
+                i += 1
+            elif token in ("--no-value", "-v"):
+                entry["no_value"] = True
+                i += 1
+            elif token.startswith("-"):
+                i += 1
+            else:
+                names.append(token)
+                i += 1
+
+        if "tier" in entry:
+            REGISTRY.append(entry)
+        for name in names:
+            REGISTRY.append({**entry, "tier": "regex" if regex else "exact", "match": name})
+
+DEBUGGER = SBDebugger()
+PROCESS  = SBProcess()
+TARGET   = SBTarget()
+THREAD   = SBThread()
+FRAME    = SBFrame()
+
+def load(path: str):
+    """Loads a recording and imports odin with this module as lldb, returns the odin module."""
+    global RECORDING
+
+    if RECORDING is not None:
+        RECORDING.close()
+    RECORDING = Recording(path)
+
+    # `python odin_replay.py` runs this file as __main__
+    sys.modules["lldb"] = sys.modules[__name__]
+
+    import odin
+    if not REGISTRY:
+        odin.__lldb_init_module(DEBUGGER, {})
+        import print_children
+        DEBUGGER.HandleCommand("command script add -f print_children.print_children print_children")
+
+    odin.ODIN_TYPE_CACHE.clear()
+    odin.STOP_CACHE.clear()
+    odin.MEMORY_CACHE.clear()
+    return odin
+
+
+# ------------------------------------------------------------------------------
+# Commands
+#
+# The output of the LLDB commands used by the tests
+
+def value_text(value: SBValue) -> str:
+    """What `p` and `frame variable` print after the type, for a value with a summary or a scalar value."""
+    entry   = value.summary_entry()
+    summary = value.GetSummary() if entry is not None else None
+    if entry is not None and entry["no_value"] and summary is not None:
+        return summary
+    text = value.GetValue()
+    if text is not None and summary is not None:
+        return f"{text} {summary}"
+    if text is not None:
+        return text
+    if summary is not None:
+        return summary
+    raise ValueError(f"{value.name} has neither a summary nor a value")
+
+def run_command(command: str) -> str | None:
+    """Output of an LLDB command, None for the commands that cannot be replayed."""
+    tokens = command.split(None, 1)
+    if not tokens:
+        return None
+    name = tokens[0]
+    args = tokens[1] if len(tokens) > 1 else ""
+
+    try:
+        if name in ("p", "print", "dwim-print", "expression", "expr"):
+            value = FRAME.GetValueForVariablePath(args)
+            if not value.IsValid():
+                return None
+            return f"({value.type.name}) {value_text(value)}"
+
+        if name in ("v", "var") or command.startswith(("frame v ", "frame variable ")):
+            paths = args.split()[1:] if name == "frame" else args.split()
+            lines = []
+            for path in paths:
+                value = FRAME.GetValueForVariablePath(path)
+                if not value.IsValid():
+                    return None
+                lines.append(f"({value.type.name}) {path} = {value_text(value)}")
+            return "\n".join(lines) if lines else None
+
+        function = DEBUGGER.commands.get(name)
+        if function is not None:
+            result = SBCommandReturnObject()
+            resolve(function)(DEBUGGER, args, result, {})
+            return (result.GetOutput() + result.GetError()).strip()
+
+    except ValueError:
+        return None
+
+    return None
+
+
+# ------------------------------------------------------------------------------
+# Runner
+
+def main() -> bool:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Replay the LLDB Odin formatters on a recording")
+    parser.add_argument("recording",                                        help="file written by odin-record")
+    parser.add_argument("-c", "--command", action="append", default=[],     help="LLDB command to replay, e.g. \"p foo\"")
+    parser.add_argument("--bench",         action="store_true",             help="time the summary and children of every variable")
+    parser.add_argument("--repeat",        type=int, default=10,            help="timed runs per case")
+    args = parser.parse_args()
+
+    odin = load(args.recording)
+
+    for command in args.command:
+        output = run_command(command)
+        print(f"(lldb) {command}")
+        print(output if output is not None else "error: cannot replay this command")
+
+    if args.command:
+        return True
+
+    if not args.bench:
+        for value in FRAME.GetVariables():
+            try:
+                print(f"({value.type.name}) {value.name} = {value_text(value)}")
+            except ValueError:
+                print(f"({value.type.name}) {value.name}")
+        return True
+
+    from bench import OPERATIONS, summarize
+
+    for value in FRAME.GetVariables():
+        for operation, fn in OPERATIONS.items():
+            if operation == "children" and not value.IsSynthetic():
+                continue
+            times = []
+            for _ in range(args.repeat):
+                odin.STOP_CACHE.clear()
+                odin.MEMORY_CACHE.clear()
+                start = time.perf_counter_ns()
+                fn(odin, value)
+                times.append((time.perf_counter_ns() - start) / 1e6)
+            stats = summarize(times)
+            print(f"  {value.name + '.' + operation:<36} min {stats['min']:>9.3f} ms  p50 {stats['p50']:>9.3f} ms  p90 {stats['p90']:>9.3f} ms")
+
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -4,16 +4,27 @@ Test script for LLDB Odin variable summaries.
 
 This script:
 1. Builds the Odin program using build.sh
-2. Starts an LLDB debug session using CLI interface
+2. Starts LLDB debug sessions using CLI interface, test cases are split between concurrent sessions
 3. Parses main.odin for expected test cases
 4. Runs the debug session and validates variable summaries
+
+Usage:
+    ./test.py                       run the tests in LLDB
+    ./test.py --record main.rec     run them in a single LLDB session and record it with odin_replay.py
+    ./test.py --replay main.rec     run them on the recording, without building or starting LLDB
+
+Recordings are not committed, replays are for local work only (see readme.md).
 """
 
+import argparse
+import os
 import re
+import time
 import subprocess
 import sys
 import shutil
-from typing import List, Optional
+from typing import List, Optional, Sequence
+from concurrent.futures import ThreadPoolExecutor
 
 class ANSI:
     RED       = '\033[91m'
@@ -37,7 +48,8 @@ def highlight (text: str) -> str: return colored(text, ANSI.BOLD)
 
 
 class TestCase:
-    def __init__(self, command: str, expected: str):
+    def __init__(self, index: int, command: str, expected: str):
+        self.index    = index # order in main.odin, results are keyed by it since commands can repeat
         self.command  = command
         self.expected = expected
 
@@ -105,7 +117,7 @@ def parse_test_cases(filename: str) -> List[TestCase]:
                 
                 if expected_lines:
                     expected = '\n'.join(expected_lines)
-                    test_cases.append(TestCase(command, expected))
+                    test_cases.append(TestCase(len(test_cases), command, expected))
         
         line_i += 1
 
@@ -139,7 +151,7 @@ def compare_outputs(expected: str, actual: str) -> bool:
 
     return True
 
-def run_lldb(test_cases: List[TestCase]) -> str:
+def run_lldb(test_cases: List[TestCase], before: Sequence[str] = (), after: Sequence[str] = ()) -> str:
 
     cmd = ["lldb", "main.bin",
            "--no-lldbinit",
@@ -149,54 +161,29 @@ def run_lldb(test_cases: List[TestCase]) -> str:
            "-o", "r",
            "-o", "up"]
 
-    for test_case in test_cases:
+    for command in [*before, *(test_case.command for test_case in test_cases), *after]:
         cmd.append("-o")
-        cmd.append(test_case.command)
+        cmd.append(command)
 
     cmd.append("-o")
     cmd.append("quit")
 
-    print(info("Running LLDB session:\n"), " ".join(cmd))
-    print_line("lldb")
-    
     timeout = 120
-    process = None
-    
+
     try:
-        result = subprocess.run(cmd, 
-                                capture_output=True, 
-                                text=True, 
+        result = subprocess.run(cmd,
+                                stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT,
+                                text=True,
                                 timeout=timeout)
-        
+
+        output = result.stdout
         if result.returncode != 0:
-            print(error(f"LLDB exited with code {result.returncode}"))
-            print(error(f"Stderr: {result.stderr}"))
-
-        # Use Popen to stream output in real-time while capturing it
-        process = subprocess.Popen(cmd,
-                                   stdout=subprocess.PIPE,
-                                   stderr=subprocess.STDOUT,
-                                   text=True,
-                                   bufsize=1,  # Line buffered
-                                   universal_newlines=True)
-        
-        output_lines = []
-        
-        # Read output line by line and display it while capturing
-        if process.stdout:
-            for line in process.stdout:
-                print(line, end='')
-                output_lines.append(line)
-        
-        return_code = process.wait(timeout=timeout)
-        if return_code != 0:
-            print(error(f"\nLLDB exited with code {return_code}"))
-        
-        return ''.join(output_lines)
-    
+            output += f"\nLLDB exited with code {result.returncode}\n"
+
+        return output
+
     except subprocess.TimeoutExpired:
-        if process:
-            process.kill()
         print(error(f"\nLLDB session timed out after {timeout} seconds"))
         print(warning("This might be due to DWARF symbol indexing taking too long."))
         return ""
@@ -205,27 +192,79 @@ def run_lldb(test_cases: List[TestCase]) -> str:
         print(info("On Ubuntu: sudo apt-get install lldb"))
         return ""
 
+# Each session pays for starting the program and indexing DWARF,
+# so shards are not made smaller than this
+MIN_CASES_PER_SHARD = 8
+
+# Commands that change how the session formats values (e.g. `odin-list`),
+# the test cases after one of them depend on it and stay in its shard
+SESSION_COMMANDS = ("odin-list", "type ", "settings set", "command script", "script ")
+
+def shard_test_cases(test_cases: List[TestCase], jobs: int) -> List[List[TestCase]]:
+    """Splits the test cases into contiguous shards, keeping their order within a shard."""
+    count = max(1, min(jobs, len(test_cases) // MIN_CASES_PER_SHARD))
+    size  = -(-len(test_cases) // count)
+
+    shards: List[List[TestCase]] = []
+    changed = False
+    for test_case in test_cases:
+        if not shards or (len(shards[-1]) >= size and not changed):
+            shards.append([])
+        shards[-1].append(test_case)
+        changed = changed or test_case.command.startswith(SESSION_COMMANDS)
+
+    return shards
+
+def run_lldb_sharded(test_cases: List[TestCase], jobs: int) -> dict[int, str | None]:
+    """Runs the shards in concurrent LLDB sessions and merges their parsed outputs."""
+
+    shards = shard_test_cases(test_cases, jobs)
+
+    print(info(f"Running {len(test_cases)} test cases in {len(shards)} LLDB sessions"))
+
+    def run_shard(shard: List[TestCase]) -> tuple[str, float]:
+        start = time.perf_counter()
+        output = run_lldb(shard)
+        return output, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=len(shards)) as pool:
+        shard_results = list(pool.map(run_shard, shards))
+
+    results: dict[int, str | None] = {}
+
+    for i, (shard, (output, elapsed)) in enumerate(zip(shards, shard_results)):
+        print_line(f"lldb shard {i}")
+        print(output, end='')
+        results.update(parse_lldb_output(output, shard))
+
+    print_line("shards")
+    for i, (shard, (_, elapsed)) in enumerate(zip(shards, shard_results)):
+        print(info(f"  shard {i}: {len(shard)} test cases in {elapsed:.2f}s"))
+
+    return results
 
-def parse_lldb_output(output: str, test_cases: List[TestCase]) -> dict[str, str | None]:
 
-    results: dict[str, str | None] = {}
+def parse_lldb_output(output: str, test_cases: List[TestCase]) -> dict[int, str | None]:
+
+    results: dict[int, str | None] = {}
 
     start_from = 0
     
     for test_case in test_cases:
         start_marker = f"(lldb) {test_case.command}\n"
         
-        start_idx = output.find(start_marker, start_from) + len(start_marker)
-        end_idx   = output.find("\n(lldb) ", start_idx)
+        start_idx = output.find(start_marker, start_from)
+        end_idx   = output.find("\n(lldb) ", start_idx + len(start_marker))
 
         if start_idx == -1 or end_idx == -1:
-            results[test_case.command] = None
+            results[test_case.index] = None
             continue
 
+        start_idx += len(start_marker)
         start_from = end_idx+1
         
         test_output = output[start_idx:end_idx].strip()
-        results[test_case.command] = test_output
+        results[test_case.index] = test_output
     
     return results
 
@@ -265,8 +304,32 @@ def check_dependencies() -> bool:
     return True
 
 
-def run_tests() -> bool:
+def run_replay(test_cases: List[TestCase], path: str) -> dict[int, str | None]:
+    """Runs the test cases on a recording, the commands that cannot be replayed have no output."""
+    import odin_replay
+
+    print(info(f"Replaying {len(test_cases)} test cases on {path}"))
+    odin_replay.load(path)
+
+    results: dict[int, str | None] = {}
+    start = time.perf_counter()
+
+    for test_case in test_cases:
+        try:
+            results[test_case.index] = odin_replay.run_command(test_case.command)
+        except Exception as e:
+            results[test_case.index] = f"{type(e).__name__}: {e}"
+
+    print(info(f"Replayed in {(time.perf_counter() - start)*1000:.1f} ms"))
+    return results
+
+
+def run_tests(record: Optional[str] = None, replay: Optional[str] = None) -> bool:
     print(highlight("Starting LLDB Odin tests..."))
+
+    if replay:
+        test_cases = parse_test_cases("main.odin")
+        return check_results(test_cases, run_replay(test_cases, replay), skip_missing=True)
     
     # Check dependencies first
     if not check_dependencies():
@@ -278,31 +341,64 @@ def run_tests() -> bool:
         return False
     
     test_cases = parse_test_cases("main.odin")
+    
+    if record:
+        results = run_lldb_recorded(test_cases, record)
+    else:
+        results = run_lldb_sharded(test_cases, os.cpu_count() or 1)
+    
+    return check_results(test_cases, results)
+
+
+def run_lldb_recorded(test_cases: List[TestCase], path: str) -> dict[int, str | None]:
+    """Runs the test cases in one LLDB session recording everything the formatters read."""
+
+    print(info(f"Running {len(test_cases)} test cases in one LLDB session, recording to {path}"))
+
+    output = run_lldb(test_cases,
+                      before=["command script import odin_replay.py", "odin-record start"],
+                      after=[f"odin-record stop {path}"])
+
+    print_line("lldb")
+    print(output, end='')
+    return parse_lldb_output(output, test_cases)
+
+
+def check_results(test_cases: List[TestCase], results: dict[int, str | None], skip_missing: bool = False) -> bool:
     if not test_cases:
         print(warning("No test cases found"))
         return False
-    
-    lldb_output = run_lldb(test_cases)
-    
+
     print_line("end")
     
-    results = parse_lldb_output(lldb_output, test_cases)
-    
-    failed = 0
+    failed  = 0
+    skipped = 0
     
     for test_case in test_cases:
-        actual_output = results.get(test_case.command)
-        if not run_test_case(test_case, actual_output):
+        actual_output = results.get(test_case.index)
+        if actual_output is None and skip_missing:
+            print(warning(f"  SKIP: {test_case.command}"))
+            skipped += 1
+        elif not run_test_case(test_case, actual_output):
             failed += 1
 
-    if failed == 0:
+    if failed == 0 and skipped == 0:
         print(success("All tests passed! 🎉"))
         return True
-    else:
-        print(error(f"  Failed: {len(test_cases)-failed}/{len(test_cases)}"))
-        return False
+
+    # a skipped test case is not a passed one, the recording is missing what it needs
+    if skipped > 0:
+        print(error(f"  Skipped: {skipped}/{len(test_cases)}"))
+    if failed > 0:
+        print(error(f"  Failed: {failed}/{len(test_cases)-skipped}"))
+    return False
 
 
 if __name__ == "__main__":
-    test_success = run_tests()
+    parser = argparse.ArgumentParser(description="Test the LLDB Odin formatters")
+    parser.add_argument("--record", metavar="FILE", help="run in a single LLDB session and record it")
+    parser.add_argument("--replay", metavar="FILE", help="run on a recording instead of LLDB")
+    args = parser.parse_args()
+
+    test_success = run_tests(record=args.record, replay=args.replay)
     sys.exit(0 if test_success else 1)